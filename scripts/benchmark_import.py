@@ -0,0 +1,34 @@
+"""
+Measure the time it takes to import `xenon` in a fresh interpreter.
+
+Usage: python scripts/benchmark_import.py [repeat] [statement]
+
+Prints the best and median wall-clock time over `repeat` runs (default 10)
+of `statement` (default `import xenon`), each run in a new Python process.
+The time it takes to start an empty interpreter is subtracted.
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+
+def run(statement):
+    start = time.perf_counter()
+    subprocess.check_call([sys.executable, '-c', statement])
+    return time.perf_counter() - start
+
+
+def measure(statement, repeat):
+    return [run(statement) for _ in range(repeat)]
+
+
+if __name__ == '__main__':
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    statement = sys.argv[2] if len(sys.argv) > 2 else 'import xenon'
+
+    baseline = min(measure('pass', repeat))
+    times = [t - baseline for t in measure(statement, repeat)]
+    print("{!r}: best {:.1f} ms, median {:.1f} ms ({} runs)".format(
+        statement, min(times) * 1e3, statistics.median(times) * 1e3, repeat))
@@ -1,6 +1,11 @@
+import sys
+
 import pytest
 import xenon
 
+# The asynchronous API needs asynchronous generators, new in Python 3.6.
+collect_ignore = ['test_aio.py'] if sys.version_info < (3, 6) else []
+
 
 @pytest.fixture(scope="session")
 def xenon_server(request):
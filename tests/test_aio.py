@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from xenon import Path, XenonException, aio
+from xenon.server import __server__
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_aio_exists(xenon_server, tmpdir):
+    async def main():
+        async with await aio.FileSystem.create(adaptor='file') as fs:
+            tmp = Path(str(tmpdir))
+            checks = await asyncio.gather(
+                fs.exists(tmp), fs.exists(tmp / 'does-not-exist'))
+            return [bool(x) for x in checks]
+
+    assert run(main()) == [True, False]
+
+
+def test_aio_streams(xenon_server, tmpdir):
+    test_file = Path(str(tmpdir.join('test-aio.txt')))
+
+    async def main():
+        async with await aio.FileSystem.create(adaptor='file') as fs:
+            async def data():
+                for i in range(16):
+                    yield "{}\n".format(i).encode()
+
+            await fs.write_to_file(test_file, data())
+
+            result = bytearray()
+            async for chunk in fs.read_from_file(test_file):
+                result.extend(chunk)
+            return result.decode()
+
+    assert run(main()).split() == [str(i) for i in range(16)]
+
+
+def test_aio_successive_loops(xenon_server, tmpdir):
+    async def main():
+        async with await aio.FileSystem.create(adaptor='file') as fs:
+            return bool(await fs.exists(Path(str(tmpdir))))
+
+    assert run(main())
+    assert run(main())
+    # the channel of the first, closed, loop has been dropped
+    assert len(__server__.aio_channels) == 1
+
+
+def test_aio_list_error(xenon_server, tmpdir):
+    async def main():
+        async with await aio.FileSystem.create(adaptor='file') as fs:
+            missing = Path(str(tmpdir)) / 'missing'
+            async for _ in fs.list(missing, recursive=False):
+                pass
+
+    with pytest.raises(XenonException) as excinfo:
+        run(main())
+    assert str(excinfo.value).endswith(' in list')
@@ -0,0 +1,40 @@
+import os
+
+from xenon import Path
+
+
+def make_tree(root):
+    for i in range(50):
+        root.join('d{}'.format(i % 5), 'f{}.txt'.format(i)).write(
+            str(i), ensure=True)
+
+
+def test_upload_archive(local_scheduler, tmpdir):
+    make_tree(tmpdir.join('local'))
+
+    local_scheduler.upload_archive(
+        str(tmpdir.join('local')), Path(str(tmpdir.join('remote'))))
+
+    assert tmpdir.join('remote', 'd3', 'f13.txt').read() == '13'
+    assert len(tmpdir.join('remote').listdir()) == 5
+
+
+def test_download_archive(local_scheduler, tmpdir):
+    make_tree(tmpdir.join('remote'))
+
+    local_scheduler.download_archive(
+        Path(str(tmpdir.join('remote'))), str(tmpdir.join('local')))
+
+    assert tmpdir.join('local', 'd4', 'f49.txt').read() == '49'
+    assert len(tmpdir.join('local').listdir()) == 5
+
+
+def test_upload_archive_relative(local_scheduler, tmpdir):
+    make_tree(tmpdir.join('local'))
+    working_directory = str(
+        local_scheduler.get_file_system().get_working_directory())
+    relative = os.path.relpath(str(tmpdir.join('remote')), working_directory)
+
+    local_scheduler.upload_archive(str(tmpdir.join('local')), Path(relative))
+
+    assert tmpdir.join('remote', 'd3', 'f13.txt').read() == '13'
@@ -0,0 +1,19 @@
+from xenon.server import ChannelConfig
+
+
+def test_default_options():
+    assert ChannelConfig().options() == []
+
+
+def test_options():
+    config = ChannelConfig(
+        max_receive_message_length=64 << 20, initial_window_size=1 << 20,
+        bdp_probe=False, keepalive_time=300, keepalive_without_calls=True)
+    options = dict(config.options())
+
+    assert options['grpc.max_receive_message_length'] == 64 << 20
+    assert options['grpc.http2.lookahead_bytes'] == 1 << 20
+    assert options['grpc.http2.bdp_probe'] == 0
+    assert options['grpc.keepalive_time_ms'] == 300000
+    assert options['grpc.keepalive_permit_without_calls'] == 1
+    assert 'grpc.keepalive_timeout_ms' not in options
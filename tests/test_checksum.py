@@ -0,0 +1,39 @@
+import hashlib
+
+import pytest
+from xenon import Path
+from xenon.checksum import (Checksum, ChecksumError)
+
+
+def test_checksum_stream():
+    chunks = [b'abc', b'def', b'']
+    checksum = Checksum(chunks, 'md5')
+    assert list(checksum) == chunks
+    assert checksum.hexdigest() == hashlib.md5(b'abcdef').hexdigest()
+
+
+@pytest.mark.parametrize('algorithm', ['md5', 'sha256'])
+def test_remote_checksum(local_scheduler, tmpdir, algorithm):
+    tmpdir.join('data.txt').write_binary(b'hello world\n')
+    expected = hashlib.new(algorithm, b'hello world\n').hexdigest()
+
+    assert local_scheduler.checksum(
+        Path(str(tmpdir.join('data.txt'))), algorithm) == expected
+
+
+def test_verified_transfers(local_filesystem, local_scheduler, tmpdir):
+    tmpdir.join('local.txt').write_binary(b'hello world\n' * 1000)
+
+    local_filesystem.upload(
+        str(tmpdir.join('local.txt')), Path(str(tmpdir.join('remote.txt'))),
+        verify=local_scheduler)
+    local_filesystem.download(
+        Path(str(tmpdir.join('remote.txt'))), str(tmpdir.join('back.txt')),
+        verify=local_scheduler)
+
+    assert tmpdir.join('back.txt').read_binary() == b'hello world\n' * 1000
+
+
+def test_remote_checksum_error(local_scheduler, tmpdir):
+    with pytest.raises(ChecksumError):
+        local_scheduler.checksum(Path(str(tmpdir.join('missing.txt'))))
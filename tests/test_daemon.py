@@ -0,0 +1,59 @@
+import os
+import socket
+import subprocess
+import sys
+from contextlib import closing
+
+import pytest
+from xenon import daemon
+
+
+@pytest.fixture
+def runtime_dir(monkeypatch, tmpdir):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmpdir))
+    return daemon.runtime_dir()
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_live_clients(runtime_dir):
+    (runtime_dir / 'clients' / '{}.a'.format(os.getpid())).touch()
+    (runtime_dir / 'clients' / '{}.b'.format(dead_pid())).touch()
+
+    clients = daemon.live_clients(runtime_dir)
+    assert [c.name for c in clients] == ['{}.a'.format(os.getpid())]
+    assert len(list((runtime_dir / 'clients').iterdir())) == 1
+
+
+def test_stale_state(runtime_dir):
+    daemon.write_state(runtime_dir, {
+        'pid': dead_pid(), 'port': 1, 'disable_tls': True,
+        'crt_file': None, 'key_file': None})
+    assert daemon.read_state(runtime_dir) is None
+
+
+def test_attach_running(runtime_dir):
+    with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as sock:
+        sock.bind(('', 0))
+        sock.listen(1)
+        port = sock.getsockname()[1]
+
+        daemon.write_state(runtime_dir, {
+            'pid': os.getpid(), 'port': port, 'disable_tls': True,
+            'crt_file': None, 'key_file': None})
+
+        first = daemon.attach(disable_tls=True)
+        second = daemon.attach(disable_tls=True)
+        assert first.port == second.port == port
+        assert len(daemon.live_clients(runtime_dir)) == 2
+
+        with pytest.raises(RuntimeError):
+            daemon.attach(disable_tls=False)
+
+        first.detach()
+        second.detach()
+        assert daemon.live_clients(runtime_dir) == []
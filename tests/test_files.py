@@ -0,0 +1,58 @@
+import csv
+import random
+
+import pytest
+from xenon import Path
+
+
+def test_open_read(local_filesystem, tmpdir):
+    data = bytes(random.randint(0, 255) for i in range(200000))
+    tmpdir.join('data.bin').write_binary(data)
+
+    with local_filesystem.open(Path(str(tmpdir.join('data.bin')))) as f:
+        buffer = bytearray(1000)
+        assert f.readinto(buffer) == 1000
+        assert bytes(buffer) + f.read() == data
+
+
+def test_open_write_text(local_filesystem, tmpdir):
+    path = Path(str(tmpdir.join('table.csv')))
+    rows = [[str(i), str(i * i)] for i in range(1000)]
+
+    with local_filesystem.open(path, 'w', newline='') as f:
+        csv.writer(f).writerows(rows)
+
+    with local_filesystem.open(path, 'r', newline='') as f:
+        assert list(csv.reader(f)) == rows
+
+
+def test_open_append(local_filesystem, tmpdir):
+    tmpdir.join('log.txt').write('first\n')
+
+    with local_filesystem.open(Path(str(tmpdir.join('log.txt'))), 'a') as f:
+        f.write('second\n')
+
+    assert tmpdir.join('log.txt').read() == 'first\nsecond\n'
+
+
+def test_open_invalid_mode(local_filesystem, tmpdir):
+    with pytest.raises(ValueError):
+        local_filesystem.open(Path(str(tmpdir.join('x'))), 'rw')
+
+
+def test_open_write_size(local_filesystem, tmpdir):
+    data = bytes(random.randint(0, 255) for i in range(100000))
+    path = Path(str(tmpdir.join('sized.bin')))
+
+    with local_filesystem.open(path, 'wb', size=len(data)) as f:
+        f.write(data)
+
+    assert tmpdir.join('sized.bin').read_binary() == data
+
+
+def test_open_size_not_writing(local_filesystem, tmpdir):
+    tmpdir.join('log.txt').write('first\n')
+    for mode in ['r', 'a']:
+        with pytest.raises(ValueError):
+            local_filesystem.open(
+                Path(str(tmpdir.join('log.txt'))), mode, size=10)
@@ -0,0 +1,55 @@
+from xenon.oop import GrpcMethod, grpc_future
+
+
+class Call(object):
+    """Stands in for a GRPC call that succeeds, and cannot be cancelled
+    anymore."""
+    def __init__(self, result):
+        self._result = result
+        self.callbacks = []
+
+    def add_done_callback(self, f):
+        self.callbacks.append(f)
+
+    def cancel(self):
+        return False
+
+    def cancelled(self):
+        return False
+
+    def result(self):
+        return self._result
+
+    def complete(self):
+        for f in self.callbacks:
+            f(self)
+
+
+class Method(object):
+    def __init__(self):
+        self.calls = []
+
+    def future(self, request, **kwargs):
+        self.calls.append(Call(request))
+        return self.calls[-1]
+
+
+class Service(object):
+    def __init__(self):
+        self.exists = Method()
+
+
+def test_grpc_future_result():
+    service = Service()
+    future = grpc_future(service, GrpcMethod('exists'), True)
+    service.exists.calls[0].complete()
+    assert future.result() is True
+
+
+def test_grpc_future_cancelled():
+    service = Service()
+    future = grpc_future(service, GrpcMethod('exists'), True)
+    assert future.cancel()
+    # the call completes anyway
+    service.exists.calls[0].complete()
+    assert future.cancelled()
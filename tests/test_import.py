@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+import pytest
+
+# Before Python 3.7, `xenon/__init__.py` imports all names eagerly.
+lazy_module_getattr = pytest.mark.skipif(
+    sys.version_info < (3, 7),
+    reason="module level __getattr__ needs Python >= 3.7")
+
+
+def run_python(code):
+    subprocess.check_call([sys.executable, '-c', code])
+
+
+def test_lazy_docstrings():
+    """Doc-strings and signatures should not be rendered on import."""
+    run_python(
+        "import xenon\n"
+        "from xenon.lazy import LazyAttribute\n"
+        "from xenon.oop import LazyMethod\n"
+        "assert isinstance(xenon.FileSystem.__dict__['exists'], LazyMethod)\n"
+        "assert isinstance(\n"
+        "    xenon.JobDescription.__dict__['__doc__'], LazyAttribute)\n")
+
+
+def test_lazy_docstrings_render():
+    from xenon import FileSystem, JobDescription
+    assert ':param path:' in FileSystem.exists.__doc__
+    assert ':ivar executable:' in JobDescription.__doc__
+    assert ':ivar id:' in FileSystem.__doc__
+
+
+@lazy_module_getattr
+def test_import_is_cheap():
+    """A bare `import xenon` loads neither grpc nor the generated protobuf
+    code; these dominate the import time."""
+    run_python(
+        "import sys\n"
+        "import xenon\n"
+        "for module in ['grpc', 'google.protobuf', 'xenon.proto.xenon_pb2',\n"
+        "               'xenon.oop', 'xenon.objects', 'xenon.server']:\n"
+        "    assert module not in sys.modules, module\n")
+
+
+@lazy_module_getattr
+def test_lazy_imports():
+    """Job descriptions can be built without loading grpc or pyOpenSSL."""
+    run_python(
+        "import sys\n"
+        "import xenon\n"
+        "description = xenon.JobDescription(\n"
+        "    executable='/bin/echo', arguments=['hello'],\n"
+        "    working_directory=xenon.Path('/tmp'))\n"
+        "assert description.__wrapped__.executable == '/bin/echo'\n"
+        "for module in ['grpc', 'OpenSSL', 'xdg', 'xenon.server']:\n"
+        "    assert module not in sys.modules, module\n")
@@ -1,8 +1,12 @@
+import concurrent.futures
 import os
 from threading import Thread
 from queue import Queue
 
+import pytest
+
 from xenon import (Scheduler, JobDescription)
+from xenon.jobs import (JobError, run_batch_job)
 
 
 def test_echo_job_oop(xenon_server, tmpdir):
@@ -81,3 +85,68 @@ def test_online_job_oop(xenon_server):
             input_queue.join()
 
         scheduler.wait_until_done(job)
+
+
+def test_wait_all_and_any(local_scheduler):
+    jobs = [local_scheduler.submit_batch_job(
+                JobDescription(executable='sleep', arguments=[str(t)]))
+            for t in [2, 0, 1]]
+
+    first = local_scheduler.wait_any(jobs)
+    assert [s.job.id for s in first] == [jobs[1].id]
+
+    statuses = local_scheduler.wait_all(jobs, timeout=30000)
+    assert [s.job.id for s in statuses] == [job.id for job in jobs]
+    assert all(s.done for s in statuses)
+
+
+def test_as_completed(local_scheduler):
+    jobs = [local_scheduler.submit_batch_job(
+                JobDescription(executable='sleep', arguments=[str(t)]))
+            for t in [2, 0, 1]]
+
+    order = [s.job.id for s in local_scheduler.as_completed(jobs)]
+    assert order == [jobs[1].id, jobs[2].id, jobs[0].id]
+
+
+def test_as_completed_timeout(local_scheduler):
+    job = local_scheduler.submit_batch_job(
+        JobDescription(executable='sleep', arguments=['10']))
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        list(local_scheduler.as_completed([job], timeout=300))
+
+    assert not local_scheduler.wait_all([job], timeout=100)[0].done
+    assert local_scheduler.wait_any([job], timeout=100) == []
+    local_scheduler.cancel_job(job)
+
+
+def test_submit_many(local_scheduler, tmpdir):
+    descriptions = [
+        JobDescription(executable='/bin/bash',
+                       arguments=['-c', 'echo {}'.format(i)],
+                       stdout=str(tmpdir.join('out-{}.txt'.format(i))))
+        for i in range(20)]
+    descriptions[5] = JobDescription(executable='')
+
+    results = local_scheduler.submit_many(descriptions, concurrency=4)
+    assert len(results) == 20
+    assert isinstance(results[5], Exception)
+
+    jobs = [r for r in results if not isinstance(r, Exception)]
+    assert len(jobs) == 19
+    statuses = local_scheduler.wait_all(jobs, timeout=30000)
+    assert all(s.done and s.exit_code == 0 for s in statuses)
+    for i in range(20):
+        if i != 5:
+            assert tmpdir.join('out-{}.txt'.format(i)).read().strip() == \
+                str(i)
+
+
+def test_run_batch_job_timeout(local_scheduler):
+    with pytest.raises(JobError) as excinfo:
+        run_batch_job(local_scheduler, JobDescription(
+            executable='sleep', arguments=['10']), timeout=200)
+
+    assert 'timed out' in str(excinfo.value)
+    assert not excinfo.value.status.done
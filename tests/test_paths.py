@@ -1,6 +1,6 @@
 import pytest
 from xenon import (
-    Path, PathAlreadyExistsException,
+    Path, PathAlreadyExistsException, XenonException,
     PosixFilePermission)
 
 
@@ -28,3 +28,17 @@ def test_posix_file_permissions(local_filesystem, tmpdir):
     local_filesystem.create_file(filename)
     local_filesystem.set_posix_file_permissions(filename, [
         PosixFilePermission.OWNER_READ])
+
+
+def test_exists_async(local_filesystem, tmpdir):
+    tmpdir = Path(str(tmpdir))
+    futures = [local_filesystem.exists_async(tmpdir / name)
+               for name in ['.', 'does-not-exist']]
+    assert [bool(f.result()) for f in futures] == [True, False]
+
+
+def test_list_error(local_filesystem, tmpdir):
+    tmpdir = Path(str(tmpdir))
+    with pytest.raises(XenonException) as excinfo:
+        list(local_filesystem.list(tmpdir / 'missing', recursive=False))
+    assert str(excinfo.value).endswith(' in list')
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+
+from xenon import JobDescription
+from xenon.polling import JobStatusPoller, JobWatcher
+
+
+def test_job_status_poller(local_scheduler):
+    jobs = [local_scheduler.submit_batch_job(
+                JobDescription(executable='sleep', arguments=['1']))
+            for _ in range(5)]
+
+    with JobStatusPoller(local_scheduler, ttl=10, interval=0.1) as poller:
+        results = []
+
+        def query(job):
+            results.append(poller.get_status(job).job.id)
+
+        threads = [threading.Thread(target=query, args=(job,))
+                   for job in jobs * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(results) == sorted(job.id for job in jobs * 4)
+        assert [s.job.id for s in poller.get_statuses(jobs)] == \
+            [job.id for job in jobs]
+
+    for job in jobs:
+        local_scheduler.wait_until_done(job)
+
+
+def test_job_watcher(local_scheduler):
+    jobs = [local_scheduler.submit_batch_job(
+                JobDescription(executable='sleep', arguments=['1']))
+            for _ in range(3)]
+    events = []
+
+    with JobWatcher(local_scheduler, interval=0.1, batch_size=2) as watcher:
+        watcher.add_listener(
+            lambda job, status, previous: events.append(
+                (job.id, status.state, previous)))
+        futures = [watcher.watch(job) for job in jobs]
+
+        statuses = [future.result(timeout=30) for future in futures]
+        assert all(status.done for status in statuses)
+        assert not watcher.jobs
+
+    for job in jobs:
+        transitions = [(state, previous)
+                       for job_id, state, previous in events
+                       if job_id == job.id]
+        assert transitions[0][1] is None
+        assert transitions[-1][0] == statuses[0].state
+        assert all(a[0] == b[1] for a, b in zip(transitions, transitions[1:]))
+
+
+def test_job_watcher_watch_twice(local_scheduler):
+    job = local_scheduler.submit_batch_job(
+        JobDescription(executable='sleep', arguments=['1']))
+    called = []
+
+    with JobWatcher(local_scheduler, interval=0.1) as watcher:
+        first = watcher.watch(
+            job, lambda job, status, previous: called.append('first'))
+        second = watcher.watch(
+            job, lambda job, status, previous: called.append('second'))
+        assert first is second
+        assert first.result(timeout=30).done
+
+    assert 'first' in called and 'second' in called
+
+
+def test_job_watcher_events(local_scheduler):
+    job = local_scheduler.submit_batch_job(
+        JobDescription(executable='sleep', arguments=['1']))
+
+    async def watch():
+        with JobWatcher(local_scheduler, interval=0.1) as watcher:
+            events = watcher.events()
+            watcher.watch(job)
+            # changes before iteration starts are not lost
+            await asyncio.sleep(0.5)
+            previous_states = []
+            async for event_job, status, previous in events:
+                assert event_job.id == job.id
+                previous_states.append(previous)
+                if status.done:
+                    return previous_states, status
+
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        previous_states, status = loop.run_until_complete(watch())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+    assert previous_states[0] is None
+    assert status.done
+
+
+def test_job_status_poller_invalidate(local_scheduler):
+    jobs = [local_scheduler.submit_batch_job(
+                JobDescription(executable='sleep', arguments=['1']))
+            for _ in range(2)]
+
+    with JobStatusPoller(local_scheduler, ttl=10, interval=0.5) as poller:
+        poller.get_status(jobs[0])
+
+        # jobs[0] is fresh; its entry disappears while waiting for jobs[1]
+        def invalidate():
+            time.sleep(0.1)
+            poller.invalidate(jobs[0])
+
+        thread = threading.Thread(target=invalidate)
+        thread.start()
+        statuses = poller.get_statuses(jobs)
+        thread.join()
+
+        assert [s.job.id for s in statuses] == [job.id for job in jobs]
+
+    for job in jobs:
+        local_scheduler.wait_until_done(job)
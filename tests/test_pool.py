@@ -0,0 +1,25 @@
+import pytest
+
+from xenon import pool as pool_module
+from xenon.pool import ServerPool
+
+
+def test_server_pool():
+    with ServerPool(size=1, disable_tls=True) as pool:
+        server = pool.acquire(timeout=60)
+        try:
+            assert server.is_healthy()
+        finally:
+            server.kill()
+
+        assert not server.is_healthy()
+
+
+def test_server_pool_start_error(monkeypatch):
+    def start_warm_server(disable_tls, startup_timeout):
+        raise FileNotFoundError("java")
+
+    monkeypatch.setattr(pool_module, 'start_warm_server', start_warm_server)
+    with ServerPool(size=1, disable_tls=True) as pool:
+        with pytest.raises(FileNotFoundError):
+            pool.acquire(timeout=60)
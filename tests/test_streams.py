@@ -1,5 +1,8 @@
 import random
+
+import pytest
 from xenon import (FileSystem, Path)
+from xenon.transfer import coalesce
 
 
 def read_lines(stream):
@@ -42,3 +45,108 @@ def test_files_writing_oop(xenon_server, tmpdir):
         out_data = [int(line.strip())
                     for line in open(test_file) if line != '']
         assert test_data == out_data
+
+
+def test_download(local_filesystem, tmpdir):
+    data = bytes(random.randint(0, 255) for i in range(200000))
+    tmpdir.join('remote.dat').write_binary(data)
+
+    size = local_filesystem.download(
+        Path(str(tmpdir.join('remote.dat'))), str(tmpdir.join('local.dat')))
+
+    assert size == len(data)
+    assert tmpdir.join('local.dat').read_binary() == data
+
+
+def test_download_many(local_filesystem, tmpdir):
+    for i in range(10):
+        tmpdir.join('remote-{}.txt'.format(i)).write(str(i) * (i + 1))
+
+    paths = [(Path(str(tmpdir.join('remote-{}.txt'.format(i)))),
+              str(tmpdir.join('local-{}.txt'.format(i))))
+             for i in range(10)]
+    sizes = local_filesystem.download_many(paths, max_workers=3)
+
+    assert sizes == list(range(1, 11))
+    for i in range(10):
+        assert tmpdir.join('local-{}.txt'.format(i)).read() == str(i) * (i + 1)
+
+
+def test_coalesce():
+    chunks = [b'a'] * 10 + [b'b' * 8] + [b'c'] * 3
+    assert list(coalesce(chunks, 4)) == \
+        [b'aaaa', b'aaaa', b'aab' + b'b' * 7, b'ccc']
+
+
+def test_upload(local_filesystem, tmpdir):
+    data = bytes(random.randint(0, 255) for i in range(200000))
+    tmpdir.join('local.dat').write_binary(data)
+
+    size = local_filesystem.upload(
+        str(tmpdir.join('local.dat')), Path(str(tmpdir.join('remote.dat'))),
+        chunk_size=4096)
+
+    assert size == len(data)
+    assert tmpdir.join('remote.dat').read_binary() == data
+
+
+def test_upload_many(local_filesystem, tmpdir):
+    for i in range(10):
+        tmpdir.join('local-{}.txt'.format(i)).write(str(i) * (i + 1))
+
+    paths = [(str(tmpdir.join('local-{}.txt'.format(i))),
+              Path(str(tmpdir.join('remote-{}.txt'.format(i)))))
+             for i in range(10)]
+    sizes = local_filesystem.upload_many(paths, max_workers=3)
+
+    assert sizes == list(range(1, 11))
+    for i in range(10):
+        assert tmpdir.join('remote-{}.txt'.format(i)).read() == \
+            str(i) * (i + 1)
+
+
+def test_read_into(local_filesystem, tmpdir):
+    data = bytes(random.randint(0, 255) for i in range(200000))
+    tmpdir.join('data.bin').write_binary(data)
+    path = Path(str(tmpdir.join('data.bin')))
+
+    buffer = bytearray(len(data) + 10)
+    assert local_filesystem.read_into(path, buffer) == len(data)
+    assert buffer[:len(data)] == data
+
+    with pytest.raises(ValueError):
+        local_filesystem.read_into(path, bytearray(1000))
+
+    assert b''.join(local_filesystem.iter_memoryviews(path)) == data
+
+
+def test_upload_chunked(local_filesystem, tmpdir):
+    data = bytes(random.randint(0, 255) for i in range(200000))
+    tmpdir.join('local.dat').write_binary(data)
+    tmpdir.join('empty.dat').write_binary(b'')
+
+    paths = [(str(tmpdir.join(name + '.dat')),
+              Path(str(tmpdir.join(name + '-remote.dat'))))
+             for name in ['local', 'empty']]
+    sizes = local_filesystem.upload_many(paths, chunk_size=65536)
+
+    assert sizes == [len(data), 0]
+    assert tmpdir.join('local-remote.dat').read_binary() == data
+    assert tmpdir.join('empty-remote.dat').read_binary() == b''
+
+
+def test_write_request_stream_coalescing():
+    from xenon.objects import write_request_stream
+    from xenon.proto import xenon_pb2
+
+    filesystem = xenon_pb2.FileSystem(id='fs')
+    chunks = [b'line\n'] * 10
+
+    # by default every chunk is sent as it comes
+    requests = list(write_request_stream(filesystem, Path('/a'), chunks))
+    assert [r.buffer for r in requests[1:]] == chunks
+
+    requests = list(write_request_stream(
+        filesystem, Path('/a'), chunks, min_chunk_size=20))
+    assert [r.buffer for r in requests[1:]] == \
+        [b'line\n' * 4, b'line\n' * 4, b'line\n' * 2]
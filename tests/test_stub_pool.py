@@ -0,0 +1,27 @@
+import threading
+
+from xenon.server import StubPool
+
+
+class Stub(object):
+    def __init__(self, name):
+        self.name = name
+
+    def exists(self):
+        return self.name
+
+
+def test_round_robin():
+    pool = StubPool([Stub('a'), Stub('b'), Stub('c')])
+    assert [pool.exists() for _ in range(6)] == list('abcabc')
+
+
+def test_thread_affinity():
+    pool = StubPool([Stub('a'), Stub('b')], thread_affinity=True)
+    assert {pool.exists() for _ in range(4)} == {pool.exists()}
+
+    result = []
+    thread = threading.Thread(target=lambda: result.append(pool.exists()))
+    thread.start()
+    thread.join()
+    assert result != [pool.exists()]
@@ -0,0 +1,48 @@
+import types
+
+import pytest
+
+from xenon import JobDescription
+from xenon.sweep import (grid, expand, array_job)
+
+
+def test_expand():
+    template = JobDescription(
+        executable='simulate', arguments=['--size', '{size}', '{{x}}'],
+        environment={'SEED': '{seed}'}, stdout='out-{size}-{seed}.txt')
+    descriptions = expand(template, {'size': [10, 20], 'seed': range(3)})
+    assert isinstance(descriptions, types.GeneratorType)
+
+    descriptions = list(descriptions)
+    assert len(descriptions) == 6
+    assert descriptions[1].arguments == ['--size', '10', '{x}']
+    assert descriptions[1].environment == {'SEED': '1'}
+    assert descriptions[5].stdout == 'out-20-2.txt'
+    assert descriptions[0].executable == 'simulate'
+    assert not hasattr(descriptions[0], 'name')
+
+    assert list(grid({'a': [1, 2], 'b': 'xy'}))[1] == {'a': 1, 'b': 'y'}
+
+
+def test_array_job():
+    template = JobDescription(
+        executable='simulate', scheduler_arguments=['--exclusive'])
+    description, variable = array_job(template, 100, 'slurm')
+    assert description.scheduler_arguments == \
+        ['--exclusive', '--array=0-99']
+    assert variable == 'SLURM_ARRAY_TASK_ID'
+    assert template.scheduler_arguments == ['--exclusive']
+
+    with pytest.raises(ValueError):
+        array_job(template, 100, 'local')
+
+
+def test_submit_sweep(local_scheduler, tmpdir):
+    template = JobDescription(
+        executable='/bin/bash', arguments=['-c', 'echo {a} {b}'],
+        stdout=str(tmpdir.join('out-{a}-{b}.txt')))
+    jobs = local_scheduler.submit_sweep(
+        template, {'a': [1, 2], 'b': [3, 4]}, concurrency=2)
+    statuses = local_scheduler.wait_all(jobs, timeout=30000)
+    assert all(s.done and s.exit_code == 0 for s in statuses)
+    assert tmpdir.join('out-2-3.txt').read().strip() == '2 3'
@@ -0,0 +1,116 @@
+import os
+
+from xenon import Path
+from xenon.sync import (Manifest, leaf_directories)
+
+
+def make_tree(root):
+    for i in range(12):
+        root.join('a{}'.format(i % 3), 'b{}'.format(i % 2),
+                  'f{}.txt'.format(i)).write(str(i), ensure=True)
+    root.join('empty', 'dir').ensure(dir=True)
+
+
+def test_leaf_directories():
+    assert leaf_directories(['a', 'a/b', 'a/c', 'd']) == ['a/b', 'a/c', 'd']
+
+
+def test_manifest(tmpdir):
+    path = tmpdir.join('manifest')
+    with Manifest(path) as manifest:
+        manifest.add('a/b', 10, 1000)
+
+    path.write('{"path": "a/c", "si', mode='a')
+    with Manifest(path) as manifest:
+        assert manifest.is_done('a/b', 10, 1000)
+        assert not manifest.is_done('a/b', 10, 2000)
+        assert not manifest.is_done('a/c', 10, 1000)
+        manifest.add('a/c', 1, 1)
+
+    assert Manifest(path).is_done('a/c', 1, 1)
+
+
+def test_sync_tree(local_filesystem, tmpdir):
+    make_tree(tmpdir.join('src'))
+    manifest = str(tmpdir.join('manifest'))
+
+    transferred = local_filesystem.sync_tree(
+        Path(str(tmpdir.join('src'))), local_filesystem,
+        Path(str(tmpdir.join('dst'))), max_workers=4, manifest=manifest)
+
+    assert len(transferred) == 12
+    assert tmpdir.join('dst', 'a1', 'b1', 'f1.txt').read() == '1'
+    assert tmpdir.join('dst', 'empty', 'dir').isdir()
+
+    # everything is in the manifest, so nothing is transferred again
+    assert local_filesystem.sync_tree(
+        Path(str(tmpdir.join('src'))), local_filesystem,
+        Path(str(tmpdir.join('dst'))), manifest=manifest) == []
+
+
+def test_sync_tree_to_local_disk(local_filesystem, tmpdir):
+    make_tree(tmpdir.join('src'))
+
+    local_filesystem.sync_tree(
+        Path(str(tmpdir.join('src'))), None, str(tmpdir.join('local')))
+
+    assert tmpdir.join('local', 'a2', 'b0', 'f2.txt').read() == '2'
+
+
+def test_sync_tree_incremental(local_filesystem, tmpdir):
+    src = Path(str(tmpdir.join('src')))
+    dst = Path(str(tmpdir.join('dst')))
+    make_tree(tmpdir.join('src'))
+    local_filesystem.sync_tree(src, local_filesystem, dst)
+
+    tmpdir.join('src', 'a0', 'b0', 'f0.txt').write('changed')
+    tmpdir.join('src', 'new.txt').write('new')
+    tmpdir.join('dst', 'extra.txt').write('extra')
+    tmpdir.join('dst', 'extra', 'dir').ensure(dir=True)
+
+    transferred = local_filesystem.sync_tree(
+        src, local_filesystem, dst, incremental=True, delete=True)
+
+    assert sorted(transferred) == ['a0/b0/f0.txt', 'new.txt']
+    assert tmpdir.join('dst', 'a0', 'b0', 'f0.txt').read() == 'changed'
+    assert not tmpdir.join('dst', 'extra.txt').exists()
+    assert not tmpdir.join('dst', 'extra').exists()
+
+    assert local_filesystem.sync_tree(
+        src, local_filesystem, dst, incremental=True) == []
+
+
+def test_sync_tree_incremental_to_local_disk(local_filesystem, tmpdir):
+    src = Path(str(tmpdir.join('src')))
+    make_tree(tmpdir.join('src'))
+
+    local_filesystem.sync_tree(
+        src, None, str(tmpdir.join('local')), incremental=True)
+    assert local_filesystem.sync_tree(
+        src, None, str(tmpdir.join('local')), incremental=True) == []
+
+
+def test_upload_tree(local_filesystem, tmpdir):
+    make_tree(tmpdir.join('src'))
+    tmpdir.join('src', 'link').mksymlinkto(tmpdir.join('src', 'a0'))
+
+    transferred = local_filesystem.upload_tree(
+        str(tmpdir.join('src')), Path(str(tmpdir.join('dst'))))
+
+    assert len(transferred) == 12
+    assert tmpdir.join('dst', 'a1', 'b1', 'f1.txt').read() == '1'
+    assert tmpdir.join('dst', 'empty', 'dir').isdir()
+    assert not tmpdir.join('dst', 'link').exists()
+
+
+def test_sync_tree_relative_source(local_filesystem, tmpdir):
+    make_tree(tmpdir.join('src'))
+    relative = os.path.relpath(
+        str(tmpdir.join('src')),
+        str(local_filesystem.get_working_directory()))
+
+    transferred = local_filesystem.sync_tree(
+        Path(relative), None, str(tmpdir.join('local')))
+
+    assert len(transferred) == 12
+    assert tmpdir.join('local', 'a2', 'b0', 'f2.txt').read() == '2'
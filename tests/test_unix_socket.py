@@ -0,0 +1,37 @@
+import os
+import socket
+
+import pytest
+
+from xenon.server import check_unix_socket
+
+
+@pytest.fixture
+def unix_socket(tmpdir):
+    path = str(tmpdir.join('xenon.sock'))
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    yield path
+    sock.close()
+
+
+def test_private_socket(unix_socket):
+    os.chmod(unix_socket, 0o600)
+    assert check_unix_socket(unix_socket)
+
+
+def test_shared_socket(unix_socket):
+    os.chmod(unix_socket, 0o666)
+    with pytest.raises(RuntimeError):
+        check_unix_socket(unix_socket)
+
+
+def test_missing_socket(tmpdir):
+    assert not check_unix_socket(str(tmpdir.join('missing.sock')))
+
+
+def test_not_a_socket(tmpdir):
+    path = tmpdir.join('regular')
+    path.write('')
+    with pytest.raises(RuntimeError):
+        check_unix_socket(str(path))
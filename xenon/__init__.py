@@ -1,14 +1,13 @@
-from .server import (init)
+"""
+PyXenon: Python interface to the Xenon middleware.
 
-from .objects import (
-    JobDescription,
-    FileSystem, Scheduler, Path, Job,
-    PosixFilePermission, CopyMode, CopyStatus, JobStatus, QueueStatus)
+Most names in this package are loaded on first use, so that importing
+`xenon` is cheap. Only when the server or a service proxy is needed are
+`grpc` and the generated protobuf modules imported.
+"""
 
-from .proto.xenon_pb2 import (
-    CopyRequest, CertificateCredential, PasswordCredential, KeytabCredential,
-    PropertyDescription, CredentialMap, DefaultCredential,
-    UserCredential)
+import importlib
+import sys
 
 from .exceptions import (
     UnknownRpcException, XenonException, PathAlreadyExistsException)
@@ -20,7 +19,7 @@ from .version import (
 __version__ = pyxenon_version
 
 __all__ = [
-    'init',
+    'init', 'ChannelConfig', 'JobStatusPoller', 'JobWatcher',
     'FileSystem', 'Scheduler', 'Path',
     'PosixFilePermission', 'Job',
     'JobDescription', 'CopyRequest', 'QueueStatus', 'JobStatus',
@@ -30,3 +29,46 @@ __all__ = [
     'UserCredential', 'CopyMode',
 
     'UnknownRpcException', 'XenonException', 'PathAlreadyExistsException']
+
+
+# Where to find the names that are imported on first use.
+lazy_imports = {
+    'init': '.server', 'ChannelConfig': '.server',
+    'JobStatusPoller': '.polling', 'JobWatcher': '.polling',
+
+    'JobDescription': '.messages', 'Path': '.messages', 'Job': '.messages',
+
+    'FileSystem': '.objects', 'Scheduler': '.objects',
+    'PosixFilePermission': '.objects', 'CopyMode': '.objects',
+    'CopyStatus': '.objects', 'JobStatus': '.objects',
+    'QueueStatus': '.objects',
+
+    'CopyRequest': '.proto.xenon_pb2',
+    'CertificateCredential': '.proto.xenon_pb2',
+    'PasswordCredential': '.proto.xenon_pb2',
+    'KeytabCredential': '.proto.xenon_pb2',
+    'PropertyDescription': '.proto.xenon_pb2',
+    'CredentialMap': '.proto.xenon_pb2',
+    'DefaultCredential': '.proto.xenon_pb2',
+    'UserCredential': '.proto.xenon_pb2'}
+
+
+def __getattr__(name):
+    if name not in lazy_imports:
+        raise AttributeError(
+            "module '{}' has no attribute '{}'".format(__name__, name))
+
+    module = importlib.import_module(lazy_imports[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(lazy_imports))
+
+
+# Module level `__getattr__` needs Python >= 3.7
+if sys.version_info < (3, 7):
+    for name in lazy_imports:
+        __getattr__(name)
@@ -0,0 +1,236 @@
+"""
+Asynchronous proxies for the Xenon GRPC services, using `grpc.aio`.
+
+The classes in this module are generated from the same `GrpcMethod` tables as
+their synchronous counterparts in :py:mod:`xenon.objects`. Every unary call
+returns an awaitable, while streaming calls (`read_from_file`, `list`) become
+asynchronous iterators::
+
+    from xenon import aio
+
+    async def main():
+        async with await aio.FileSystem.create(adaptor='file') as fs:
+            async for chunk in fs.read_from_file(Path('/etc/hosts')):
+                ...
+
+A `grpc.aio` channel is created on first use in every event loop. Proxies
+are bound to the channel of the loop in which they were created, and should
+not be used from another loop. The server itself still has to be started
+using :py:func:`xenon.init`.
+"""
+
+import inspect
+
+import grpc
+
+from . import objects
+from .oop import (
+    OopProxy, make_request, make_static_request, unwrap, to_lower_camel_case,
+    call_options)
+from .objects import PathAttributes
+from .proto import (xenon_pb2, xenon_pb2_grpc)
+from .server import __server__
+from .exceptions import make_exception
+
+
+async def aio_iterate(stream):
+    """Iterate over a synchronous or asynchronous iterable."""
+    if hasattr(stream, '__aiter__'):
+        async for x in stream:
+            yield x
+    else:
+        for x in stream:
+            yield x
+
+
+def append_request_stream(self, path, data_stream):
+    async def requests():
+        yield xenon_pb2.AppendToFileRequest(
+            filesystem=unwrap(self), path=unwrap(path))
+        async for b in aio_iterate(data_stream):
+            yield xenon_pb2.AppendToFileRequest(buffer=b)
+
+    return requests()
+
+
+def write_request_stream(self, path, data_stream, size=None):
+    async def requests():
+        yield xenon_pb2.WriteToFileRequest(
+            filesystem=unwrap(self), path=unwrap(path), size=size)
+        async for b in aio_iterate(data_stream):
+            yield xenon_pb2.WriteToFileRequest(buffer=b)
+
+    return requests()
+
+
+def input_request_stream(self, description, stdin_stream):
+    async def requests():
+        yield xenon_pb2.SubmitInteractiveJobRequest(
+            scheduler=unwrap(self), description=unwrap(description),
+            stdin=b'')
+        async for msg in aio_iterate(stdin_stream):
+            yield xenon_pb2.SubmitInteractiveJobRequest(
+                scheduler=None, description=None, stdin=msg)
+
+    return requests()
+
+
+async def read_response_stream(self, stream):
+    try:
+        async for chunk in stream:
+            yield chunk.buffer
+    except grpc.RpcError as e:
+        raise make_exception(read_response_stream, e) from None
+
+
+def transform_map(f, name):
+    """Asynchronous version of :py:func:`xenon.oop.transform_map`."""
+    async def t(self, xs):
+        try:
+            async for x in xs:
+                yield f(self, x)
+        except grpc.RpcError as e:
+            raise make_exception(t, e) from None
+
+    t.__name__ = name
+    return t
+
+
+async def interactive_job_response(self, stream):
+    response = await stream.read()
+    return response.job, stream
+
+
+def aio_methods(sync_cls, cls, overrides):
+    """Get the `GrpcMethod` table of `sync_cls`, bound to `cls`. The
+    transformations that deal with streams are replaced by the asynchronous
+    versions given in `overrides`, a dictionary mapping method names to a
+    dictionary of attributes."""
+    methods = sync_cls.__methods__.__func__(cls)
+    for m in methods:
+        for attr, value in overrides.get(m.name, {}).items():
+            setattr(m, attr, value)
+    return methods
+
+
+def method_wrapper(m):
+    """Generates an asynchronous method from a `GrpcMethod` definition.
+
+    Methods with a streaming response return an asynchronous iterator, unless
+    the output transformation is a coroutine, in which case the method should
+    be awaited. All other methods are coroutines."""
+
+    def call(obj, service, *args, **kwargs):
+        if m.is_simple:
+            request = unwrap(obj)
+        elif m.input_transform is not None:
+            request = m.input_transform(obj, *args, **kwargs)
+        elif m.static:
+            request = make_static_request(m, *args, **kwargs)
+        else:
+            request = make_request(obj, m, *args, **kwargs)
+
+        f = getattr(service, to_lower_camel_case(m.name))
+        return f(request, **call_options(m))
+
+    def get_service(obj):
+        if m.static:
+            return obj.__stub__(__server__)
+        else:
+            return obj.__service__
+
+    async def unary_method(obj, *args, **kwargs):
+        """TODO: no docstring!"""
+        service = get_service(obj)
+        try:
+            result = await call(obj, service, *args, **kwargs)
+        except grpc.RpcError as e:
+            raise make_exception(m, e) from None
+
+        if m.output_transform is None:
+            return result
+        return m.output_transform(service, result)
+
+    def stream_method(obj, *args, **kwargs):
+        """TODO: no docstring!"""
+        service = get_service(obj)
+        return m.output_transform(service, call(obj, service, *args, **kwargs))
+
+    async def awaited_stream_method(obj, *args, **kwargs):
+        """TODO: no docstring!"""
+        service = get_service(obj)
+        try:
+            return await m.output_transform(
+                service, call(obj, service, *args, **kwargs))
+        except grpc.RpcError as e:
+            raise make_exception(m, e) from None
+
+    if not m.server_streaming:
+        return unary_method
+    elif inspect.iscoroutinefunction(m.output_transform):
+        return awaited_stream_method
+    else:
+        return stream_method
+
+
+class AioProxy(OopProxy):
+    """Base class for asynchronous Grpc Object wrappers."""
+    __method_wrapper__ = staticmethod(method_wrapper)
+    __future_wrapper__ = None
+
+    @classmethod
+    def __methods__(cls):
+        return []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_tb):
+        await self.close()
+
+
+class FileSystem(AioProxy):
+    """The Xenon `FileSystem` subsystem, asynchronous version. See
+    :py:class:`xenon.FileSystem` for the documentation of the methods."""
+    __servicer__ = xenon_pb2_grpc.FileSystemServiceServicer
+    __field_name__ = 'filesystem'
+
+    @classmethod
+    def __methods__(cls):
+        return aio_methods(objects.FileSystem, cls, {
+            'read_from_file': {'output_transform': read_response_stream},
+            'list': {
+                'output_transform': transform_map(PathAttributes, 'list')},
+            'write_to_file': {'input_transform': write_request_stream},
+            'append_to_file': {'input_transform': append_request_stream}})
+
+    @staticmethod
+    def __stub__(server):
+        return server.aio_file_system_stub
+
+    def __eq__(self, other):
+        return self.__wrapped__ == other.__wrapped__
+
+
+class Scheduler(AioProxy):
+    """The Xenon Schedulers subsystem, asynchronous version. See
+    :py:class:`xenon.Scheduler` for the documentation of the methods."""
+    __servicer__ = xenon_pb2_grpc.SchedulerServiceServicer
+    __field_name__ = 'scheduler'
+
+    @classmethod
+    def __methods__(cls):
+        return aio_methods(objects.Scheduler, cls, {
+            'submit_interactive_job': {
+                'input_transform': input_request_stream,
+                'output_transform': interactive_job_response},
+            'get_file_system': {
+                'output_transform': lambda s, x:
+                    FileSystem(FileSystem.__stub__(__server__), x)}})
+
+    @staticmethod
+    def __stub__(server):
+        return server.aio_scheduler_stub
+
+
+__all__ = ['FileSystem', 'Scheduler']
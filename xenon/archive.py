@@ -0,0 +1,97 @@
+"""
+Transfer of directory trees as a single tar archive.
+
+Transferring many small files one by one is dominated by round trips. The
+functions in this module stream the whole tree as one tar archive, and pack
+or unpack it on the remote side by running ``tar`` as a batch job on a
+scheduler that shares the file system. The temporary archive on the remote
+side is removed afterwards.
+"""
+
+import tarfile
+import uuid
+
+from .exceptions import (
+    PathAlreadyExistsException, NoSuchPathException)
+from .jobs import run_batch_job
+from .messages import (JobDescription, Path)
+
+
+def temporary_archive(filesystem):
+    """A unique path for a temporary archive in the working directory of
+    `filesystem`."""
+    return filesystem.get_working_directory() / \
+        '.xenon-archive-{}.tar'.format(uuid.uuid4().hex)
+
+
+def remove(filesystem, path):
+    try:
+        filesystem.delete(Path(path), recursive=False)
+    except NoSuchPathException:
+        pass
+
+
+def upload_archive(scheduler, local_dir, remote_dir, timeout=0):
+    """Upload the local directory tree `local_dir` to `remote_dir` as a tar
+    archive, which is unpacked by a batch job.
+
+    :param scheduler: the :py:class:`xenon.Scheduler` to unpack the archive
+        on; the tree is written to the file system of this scheduler.
+    :param local_dir: the local directory.
+    :param remote_dir: the remote directory; it is created if needed. A
+        relative path is relative to the working directory of the file
+        system.
+    :param timeout: maximum time in milliseconds to wait for the job, 0 to
+        wait indefinitely.
+    :raises xenon.jobs.JobError: if unpacking fails."""
+    filesystem = scheduler.get_file_system()
+    try:
+        filesystem.create_directories(Path(remote_dir))
+    except PathAlreadyExistsException:
+        pass
+
+    archive = temporary_archive(filesystem)
+    try:
+        with filesystem.open(archive, 'wb') as f:
+            with tarfile.open(fileobj=f, mode='w|') as tar:
+                tar.add(str(local_dir), arcname='.')
+
+        run_batch_job(scheduler, JobDescription(
+            executable='tar',
+            arguments=['-xf', str(archive), '-C', str(remote_dir)],
+            working_directory=str(filesystem.get_working_directory())),
+            timeout)
+    finally:
+        remove(filesystem, archive)
+
+
+def download_archive(scheduler, remote_dir, local_dir, timeout=0):
+    """Download the remote directory tree `remote_dir` to `local_dir`. The
+    tree is packed by a batch job, and the archive is unpacked while it is
+    received.
+
+    :param scheduler: the :py:class:`xenon.Scheduler` to pack the archive
+        on; the tree is read from the file system of this scheduler.
+    :param remote_dir: the remote directory. A relative path is relative to
+        the working directory of the file system.
+    :param local_dir: the local directory; it is created if needed.
+    :param timeout: maximum time in milliseconds to wait for the job, 0 to
+        wait indefinitely.
+    :raises xenon.jobs.JobError: if packing fails."""
+    filesystem = scheduler.get_file_system()
+    archive = temporary_archive(filesystem)
+    try:
+        run_batch_job(scheduler, JobDescription(
+            executable='tar',
+            arguments=['-cf', str(archive), '-C', str(remote_dir), '.'],
+            working_directory=str(filesystem.get_working_directory())),
+            timeout)
+
+        with filesystem.open(archive, 'rb') as f:
+            with tarfile.open(fileobj=f, mode='r|') as tar:
+                if hasattr(tarfile, 'data_filter'):
+                    tar.extractall(str(local_dir), filter='data')
+                else:
+                    tar.extractall(str(local_dir))
+    finally:
+        remove(filesystem, archive)
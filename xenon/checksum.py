@@ -0,0 +1,107 @@
+"""
+Checksums of transferred files.
+
+A :py:class:`Checksum` wraps a stream of chunks, such as the one returned by
+:py:meth:`xenon.FileSystem.read_from_file` or passed to
+:py:meth:`xenon.FileSystem.write_to_file`, and hashes the chunks as they pass.
+:py:func:`remote_checksum` computes the checksum of a remote file, by running
+``sha256sum`` (or a similar program) as a batch job on a scheduler that
+shares the file system.
+"""
+
+import hashlib
+import uuid
+
+from .exceptions import NoSuchPathException
+from .jobs import (JobError, run_batch_job)
+from .messages import (JobDescription, Path)
+
+
+# Programs computing the checksum of a file on the remote side.
+checksum_programs = {
+    'md5': 'md5sum',
+    'sha1': 'sha1sum',
+    'sha256': 'sha256sum',
+    'sha512': 'sha512sum'}
+
+
+class ChecksumError(IOError):
+    """The checksum of a transferred file does not match the checksum
+    computed on the other side."""
+    pass
+
+
+class Checksum(object):
+    """Iterate over `chunks`, computing their checksum on the fly.
+
+    :param chunks: iterable of bytes-like objects.
+    :param algorithm: name of a hash algorithm from :py:mod:`hashlib`.
+    """
+    def __init__(self, chunks, algorithm='sha256'):
+        self.chunks = chunks
+        self.algorithm = algorithm
+        self.hash = hashlib.new(algorithm)
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.hash.update(chunk)
+            yield chunk
+
+    def hexdigest(self):
+        """The checksum of the chunks that have passed so far."""
+        return self.hash.hexdigest()
+
+
+def remote_checksum(scheduler, path, algorithm='sha256', timeout=0):
+    """Compute the checksum of the file at `path` on the file system of
+    `scheduler`, by running a batch job. The output of the job is written to
+    a temporary file in the working directory of that file system.
+
+    :param scheduler: the :py:class:`xenon.Scheduler` to run the job on.
+    :param path: the remote path.
+    :param algorithm: one of ``'md5'``, ``'sha1'``, ``'sha256'`` or
+        ``'sha512'``.
+    :param timeout: maximum time in milliseconds to wait for the job, 0 to
+        wait indefinitely.
+    :return: the checksum as a hexadecimal string.
+    :raises ChecksumError: if the job fails."""
+    if algorithm not in checksum_programs:
+        raise ValueError(
+            "No remote program for checksum '{}'.".format(algorithm))
+
+    filesystem = scheduler.get_file_system()
+    working_directory = filesystem.get_working_directory()
+    output = working_directory / '.xenon-checksum-{}'.format(uuid.uuid4().hex)
+
+    try:
+        try:
+            run_batch_job(scheduler, JobDescription(
+                executable=checksum_programs[algorithm],
+                arguments=[str(path)],
+                working_directory=str(working_directory),
+                stdout=str(output)), timeout)
+        except JobError as e:
+            raise ChecksumError(
+                "Computing the checksum of {} failed: {}".format(path, e)) \
+                from e
+        result = b''.join(filesystem.read_from_file(Path(output))).decode()
+    finally:
+        try:
+            filesystem.delete(Path(output), recursive=False)
+        except NoSuchPathException:
+            pass
+
+    return result.split()[0]
+
+
+def verify(local_checksum, scheduler, path, timeout=0):
+    """Compare `local_checksum`, a :py:class:`Checksum` of the transferred
+    data, with the checksum of the remote file at `path`.
+
+    :raises ChecksumError: if the checksums differ."""
+    remote = remote_checksum(
+        scheduler, path, local_checksum.algorithm, timeout)
+    if remote != local_checksum.hexdigest():
+        raise ChecksumError(
+            "Checksum of {} does not match: {} locally, {} remotely."
+            .format(path, local_checksum.hexdigest(), remote))
@@ -10,7 +10,6 @@ import sys
 import site
 import signal
 
-from .create_keys import create_self_signed_cert
 from .version import xenon_grpc_version
 
 
@@ -55,6 +54,8 @@ def start_xenon_server(port=50051, disable_tls=False):
     cmd = ['java', '-jar', jar_file, '-p', str(port)]
 
     if not disable_tls:
+        # pyOpenSSL is only needed here, so we import it on demand
+        from .create_keys import create_self_signed_cert
         crt_file, key_file = create_self_signed_cert()
 
         cmd.extend([
@@ -0,0 +1,265 @@
+"""
+Shared Xenon-GRPC daemon.
+
+Instead of every Python process starting its own Xenon-GRPC server, processes
+of the same user can share a single server. The server is owned by a small
+supervisor process (``python -m xenon.daemon``), which publishes the port of
+the server in a state file in the XDG runtime directory.
+
+Clients attach to the daemon by registering themselves in the ``clients``
+directory next to the state file, and detach by removing their registration.
+Registrations of processes that no longer exist are cleaned up by the
+supervisor. Once no clients have been registered for `idle_timeout` seconds,
+the supervisor stops the server and exits. All changes to the state are made
+while holding a lock on ``daemon.lock``, so that starting, attaching and
+shutting down never race.
+
+Usually this module is used through :py:func:`xenon.init`, by passing
+``daemon=True``.
+"""
+
+import argparse
+import fcntl
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def runtime_dir():
+    """The directory containing the state of the daemon. This is a
+    subdirectory of `$XDG_RUNTIME_DIR`, only accessible to the user."""
+    from xdg import BaseDirectory
+    path = Path(BaseDirectory.get_runtime_dir(strict=False)) / 'xenon-grpc'
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    (path / 'clients').mkdir(mode=0o700, exist_ok=True)
+    return path
+
+
+@contextmanager
+def locked(path):
+    """Hold an exclusive lock on the daemon state in `path`."""
+    with open(str(path / 'daemon.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def process_exists(pid):
+    """Checks if a process with the given pid is running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_state(path):
+    """Read the published state of the daemon, or `None` if there is no
+    daemon running."""
+    try:
+        with open(str(path / 'daemon.json')) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not process_exists(state['pid']):
+        return None
+
+    return state
+
+
+def write_state(path, state):
+    """Atomically publish the state of the daemon."""
+    tmp_file = path / 'daemon.json.{}'.format(os.getpid())
+    with open(str(tmp_file), 'w') as f:
+        json.dump(state, f)
+    os.replace(str(tmp_file), str(path / 'daemon.json'))
+
+
+def remove_state(path):
+    try:
+        (path / 'daemon.json').unlink()
+    except FileNotFoundError:
+        pass
+
+
+def live_clients(path):
+    """List the registered clients, removing the registrations of processes
+    that no longer exist."""
+    clients = []
+    for client in (path / 'clients').iterdir():
+        pid = int(client.name.split('.')[0])
+        if process_exists(pid):
+            clients.append(client)
+        else:
+            client.unlink()
+    return clients
+
+
+class DaemonClient(object):
+    """Registration of this process with the shared daemon.
+
+    :ivar port: the port on which the daemon listens.
+    :ivar disable_tls: whether the daemon was started without TLS.
+    :ivar crt_file: certificate to connect to the daemon.
+    :ivar key_file: key to connect to the daemon.
+    """
+    def __init__(self, path, state):
+        self.path = path
+        self.port = state['port']
+        self.disable_tls = state['disable_tls']
+        self.crt_file = state['crt_file']
+        self.key_file = state['key_file']
+        self.registration = path / 'clients' / '{}.{}'.format(
+            os.getpid(), uuid.uuid4().hex)
+        self.registration.touch()
+
+    def detach(self):
+        """Remove the registration. When this was the last client, the
+        daemon shuts down after its idle timeout."""
+        try:
+            self.registration.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def start_supervisor(path, port, disable_tls, idle_timeout):
+    """Start the supervisor process, detached from the current session."""
+    cmd = [sys.executable, '-m', 'xenon.daemon',
+           '--idle-timeout', str(idle_timeout)]
+    if port is not None:
+        cmd.extend(['--port', str(port)])
+    if disable_tls:
+        cmd.append('--disable-tls')
+
+    with open(str(path / 'daemon.log'), 'a') as log_file:
+        return subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=log_file,
+            stderr=subprocess.STDOUT, start_new_session=True)
+
+
+def attach(port=None, disable_tls=False, idle_timeout=600,
+           startup_timeout=60):
+    """Attach to the shared daemon, starting it if it is not running.
+
+    :param port: port for a newly started daemon, by default a free port is
+        chosen. An already running daemon is used regardless of its port.
+    :param disable_tls: whether a newly started daemon should run without TLS.
+        A running daemon is only used if it has the same setting.
+    :param idle_timeout: time in seconds a newly started daemon keeps running
+        after the last client detached.
+    :param startup_timeout: time in seconds to wait for a new daemon.
+    :return: a :py:class:`DaemonClient`
+    """
+    from .server import check_port
+
+    logger = logging.getLogger('xenon')
+    path = runtime_dir()
+
+    with locked(path):
+        state = read_state(path)
+        if state is not None and state['disable_tls'] != disable_tls:
+            raise RuntimeError(
+                "A Xenon-GRPC daemon with disable_tls={} is already running."
+                .format(state['disable_tls']))
+
+        if state is not None and check_port(state['port']):
+            logger.info('Attaching to Xenon-GRPC daemon on port {}.'
+                        .format(state['port']))
+            return DaemonClient(path, state)
+
+        logger.info('Starting Xenon-GRPC daemon.')
+        supervisor = start_supervisor(path, port, disable_tls, idle_timeout)
+
+        deadline = time.monotonic() + startup_timeout
+        while time.monotonic() < deadline:
+            if supervisor.poll() is not None:
+                raise RuntimeError(
+                    "Xenon-GRPC daemon exited, see {}."
+                    .format(path / 'daemon.log'))
+
+            state = read_state(path)
+            if state is not None and state['pid'] == supervisor.pid:
+                return DaemonClient(path, state)
+
+            time.sleep(0.05)
+
+        raise RuntimeError("Xenon-GRPC daemon did not start in time.")
+
+
+def supervise(port, disable_tls, idle_timeout, poll_interval=1.0):
+    """Run the Xenon-GRPC server until it has been idle for `idle_timeout`
+    seconds. This is the main loop of the supervisor process."""
+    from .compat import (start_xenon_server, kill_process)
+    from .server import (find_free_port, print_stream, wait_for_server)
+
+    logger = logging.getLogger('xenon')
+    path = runtime_dir()
+    port = port or find_free_port()
+
+    process, crt_file, key_file = start_xenon_server(port, disable_tls)
+    for name, output in [('out', process.stdout), ('err', process.stderr)]:
+        threading.Thread(
+            target=print_stream, args=(output, name), daemon=True).start()
+
+    try:
+        wait_for_server(port, process, crt_file, key_file)
+        write_state(path, {
+            'pid': os.getpid(),
+            'port': port,
+            'disable_tls': disable_tls,
+            'crt_file': crt_file and str(crt_file),
+            'key_file': key_file and str(key_file)})
+        logger.info('Xenon-GRPC daemon listening on port {}.'.format(port))
+
+        idle_since = None
+        while process.poll() is None:
+            time.sleep(poll_interval)
+            with locked(path):
+                if live_clients(path):
+                    idle_since = None
+                elif idle_since is None:
+                    idle_since = time.monotonic()
+                elif time.monotonic() - idle_since > idle_timeout:
+                    logger.info('Xenon-GRPC daemon idle, shutting down.')
+                    remove_state(path)
+                    break
+
+    finally:
+        with locked(path):
+            state = read_state(path)
+            if state is not None and state['pid'] == os.getpid():
+                remove_state(path)
+
+        if process.poll() is None:
+            kill_process(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a Xenon-GRPC server shared by all Python processes "
+                    "of this user.")
+    parser.add_argument('--port', type=int, default=None)
+    parser.add_argument('--disable-tls', action='store_true')
+    parser.add_argument('--idle-timeout', type=float, default=600)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+    supervise(args.port, args.disable_tls, args.idle_timeout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Job state changes as `asyncio` events.
+
+This module is imported by :py:meth:`xenon.JobWatcher.events` on first use,
+so that importing :py:mod:`xenon` does not need `asyncio` support.
+"""
+
+import asyncio
+
+
+class JobEvents(object):
+    """Asynchronous iterator over the changes of state reported by a
+    :py:class:`xenon.JobWatcher`, as tuples `(job, status, previous_state)`.
+    The iterator ends when the watcher is closed.
+
+    The listener is registered on construction, so no changes are lost
+    before iteration starts. The last known statuses of jobs that are
+    already watched are delivered first, with `previous_state` `None`.
+
+    Events are delivered to the current event loop of the thread creating
+    the iterator.
+
+    :param watcher: the :py:class:`xenon.JobWatcher`.
+    """
+    def __init__(self, watcher):
+        self.watcher = watcher
+        self.loop = asyncio.get_event_loop()
+        self.queue = asyncio.Queue()
+        self.closed = False
+        watcher._subscribe(self._put, self._close)
+
+    def _put(self, *event):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+    def _close(self):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, None)
+
+    def close(self):
+        """Stop receiving events."""
+        if not self.closed:
+            self.closed = True
+            self.watcher._unsubscribe(self._put, self._close)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.closed:
+            raise StopAsyncIteration
+        event = await self.queue.get()
+        if event is None:
+            self.close()
+            raise StopAsyncIteration
+        return event
@@ -0,0 +1,237 @@
+"""
+File objects for remote files.
+
+:py:meth:`xenon.FileSystem.open` returns objects from the :py:mod:`io`
+module wrapping the raw streams defined here. These can be passed to
+anything expecting a file, e.g. :py:mod:`tarfile` or :py:mod:`csv`, without
+reading the whole file into memory. Reading is done ahead, and writing
+behind, in a separate thread.
+"""
+
+import io
+import queue
+import threading
+
+from .messages import Path
+
+
+class StreamThread(object):
+    """Runs `function` in a daemon thread, keeping the exception it raises,
+    if any."""
+    def __init__(self, function, *args):
+        self.error = None
+        self.thread = threading.Thread(
+            target=self._run, args=(function,) + args, daemon=True)
+        self.thread.start()
+
+    def _run(self, function, *args):
+        try:
+            function(*args)
+        except Exception as e:
+            self.error = e
+
+    def is_alive(self):
+        return self.thread.is_alive()
+
+    def join(self):
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+
+def put(q, item, is_stopped):
+    """Put `item` in the bounded queue `q`, giving up when `is_stopped()`
+    becomes true while waiting.
+
+    :return: `True` if the item was put in the queue."""
+    while not is_stopped():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+class RemoteFileReader(io.RawIOBase):
+    """Raw binary stream reading a remote file. A thread receives up to
+    `max_pending` chunks ahead of what has been read.
+
+    :param filesystem: the :py:class:`xenon.FileSystem` to read from.
+    :param path: the remote path.
+    :param max_pending: maximum number of chunks received ahead.
+    """
+    def __init__(self, filesystem, path, max_pending=16):
+        super(RemoteFileReader, self).__init__()
+        self.name = str(path)
+        self.mode = 'rb'
+        self._chunks = queue.Queue(max_pending)
+        self._chunk = memoryview(b'')
+        self._eof = False
+        self._thread = StreamThread(
+            self._receive, filesystem.read_from_file(Path(path)))
+
+    def _receive(self, stream):
+        try:
+            for chunk in stream:
+                if not put(self._chunks, chunk, lambda: self.closed):
+                    return
+        finally:
+            put(self._chunks, None, lambda: self.closed)
+
+    def _next_chunk(self):
+        chunk = self._chunks.get()
+        if chunk is None:
+            self._eof = True
+            self._thread.join()
+            return memoryview(b'')
+        return memoryview(chunk)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        view = memoryview(b).cast('B')
+        while not self._chunk and not self._eof:
+            self._chunk = self._next_chunk()
+
+        n = min(len(view), len(self._chunk))
+        view[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+
+def needs_size_beforehand(filesystem):
+    """Whether the adaptor of `filesystem` needs the size of a file before
+    writing it."""
+    description = type(filesystem).get_adaptor_description(
+        name=filesystem.get_adaptor_name())
+    return description.needs_size_beforehand
+
+
+class RemoteFileWriter(io.RawIOBase):
+    """Raw binary stream writing a remote file. Written data is queued and
+    sent by a thread; at most `max_pending` writes are waiting to be sent.
+    Closing the stream waits until all data is sent, and raises the error of
+    the transfer if it failed.
+
+    Some adaptors need the size of a new file before writing it, see
+    `needs_size_beforehand` in the adaptor description. For those, the
+    number of bytes that will be written has to be given as `size`.
+
+    :param filesystem: the :py:class:`xenon.FileSystem` to write to.
+    :param path: the remote path.
+    :param append: append to an existing file, instead of creating a new
+        file.
+    :param max_pending: maximum number of writes waiting to be sent.
+    :param size: the size of the new file in bytes.
+    :raises ValueError: if `size` is given when appending, or is missing
+        while the adaptor needs it.
+    """
+    def __init__(self, filesystem, path, append=False, max_pending=16,
+                 size=None):
+        super(RemoteFileWriter, self).__init__()
+        self.name = str(path)
+        self.mode = 'ab' if append else 'wb'
+        self._chunks = queue.Queue(max_pending)
+
+        if append:
+            if size is not None:
+                raise ValueError("can't give the size when appending")
+            self._thread = StreamThread(
+                filesystem.append_to_file, Path(path), self._stream())
+            return
+
+        if size is None and needs_size_beforehand(filesystem):
+            raise ValueError(
+                "the '{}' adaptor needs the size of {} before writing"
+                .format(filesystem.get_adaptor_name(), self.name))
+        self._thread = StreamThread(
+            filesystem.write_to_file, Path(path), self._stream(), size)
+
+    def _stream(self):
+        while True:
+            chunk = self._chunks.get()
+            if chunk is None:
+                return
+            yield chunk
+
+    def _put(self, item):
+        if not put(self._chunks, item, lambda: not self._thread.is_alive()):
+            self._thread.join()
+            raise IOError("Transfer to {} stopped.".format(self.name))
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        if self.closed:
+            raise ValueError("write to closed file")
+        data = bytes(b)
+        if data:
+            self._put(data)
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._put(None)
+            self._thread.join()
+        finally:
+            super(RemoteFileWriter, self).close()
+
+
+def open_remote(filesystem, path, mode='rb', buffering=-1, encoding=None,
+                errors=None, newline=None, max_pending=16, size=None):
+    """Open a remote file, with the same conventions for `mode`,
+    `buffering`, `encoding`, `errors` and `newline` as the built-in
+    :py:func:`open`. Supported modes are reading (``'r'``), writing a new
+    file (``'w'``) and appending (``'a'``), in binary or text mode.
+
+    :param filesystem: the :py:class:`xenon.FileSystem` of the file.
+    :param path: the remote path.
+    :param max_pending: maximum number of chunks read ahead or waiting to be
+        written.
+    :param size: the size in bytes of a new file, for adaptors that need it
+        before writing, see :py:class:`RemoteFileWriter`. In text mode, this
+        is the size after encoding.
+    :return: a file object."""
+    modes = set(mode)
+    kinds = modes & set('rwa')
+    if len(kinds) != 1 or not modes <= set('rwabt') or \
+            {'b', 't'} <= modes or len(mode) != len(modes):
+        raise ValueError("invalid mode: '{}'".format(mode))
+
+    binary = 'b' in modes
+    if binary and (encoding, errors, newline) != (None, None, None):
+        raise ValueError(
+            "binary mode doesn't take encoding, errors or newline arguments")
+    if buffering == 0 and not binary:
+        raise ValueError("can't have unbuffered text I/O")
+    if size is not None and 'w' not in modes:
+        raise ValueError("size is only given when writing a new file")
+
+    if 'r' in modes:
+        raw = RemoteFileReader(filesystem, path, max_pending)
+    else:
+        raw = RemoteFileWriter(
+            filesystem, path, append='a' in modes, max_pending=max_pending,
+            size=size)
+
+    if buffering == 0:
+        return raw
+
+    if buffering < 0:
+        buffering = io.DEFAULT_BUFFER_SIZE
+    if 'r' in modes:
+        buffered = io.BufferedReader(raw, buffering)
+    else:
+        buffered = io.BufferedWriter(raw, buffering)
+
+    if binary:
+        return buffered
+
+    text = io.TextIOWrapper(buffered, encoding, errors, newline)
+    text.mode = mode
+    return text
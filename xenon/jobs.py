@@ -0,0 +1,191 @@
+"""
+Helpers for running jobs on a :py:class:`xenon.Scheduler`.
+
+:py:func:`wait_all`, :py:func:`wait_any` and :py:func:`as_completed` wait
+for many jobs at once. They share one polling loop, which queries the
+statuses of all unfinished jobs with a single
+:py:meth:`xenon.Scheduler.get_job_statuses` call. The poll interval starts
+at `min_interval` and grows up to `max_interval` while no job finishes.
+
+:py:func:`submit_many` submits many batch jobs, keeping several submissions
+in flight at once instead of waiting for each round trip.
+"""
+
+import concurrent.futures
+import threading
+import time
+
+
+# Bounds of the adaptive interval between polls, in seconds.
+MIN_POLL_INTERVAL = 0.1
+MAX_POLL_INTERVAL = 5.0
+
+# Default number of concurrent submissions in `submit_many`.
+SUBMIT_CONCURRENCY = 32
+
+
+class JobError(RuntimeError):
+    """A job did not finish successfully.
+
+    :ivar status: the last :py:class:`xenon.JobStatus` of the job.
+    """
+    def __init__(self, message, status):
+        super(JobError, self).__init__(message)
+        self.status = status
+
+
+def run_batch_job(scheduler, description, timeout=0):
+    """Submit a batch job and wait until it is done. If waiting fails or
+    times out, the job is cancelled.
+
+    :param scheduler: the :py:class:`xenon.Scheduler` to run the job on.
+    :param description: the :py:class:`xenon.JobDescription` of the job.
+    :param timeout: maximum time in milliseconds to wait for the job, 0 to
+        wait indefinitely.
+    :return: the final :py:class:`xenon.JobStatus`.
+    :raises JobError: if the job did not finish with exit code 0, or did not
+        finish before `timeout`."""
+    job = scheduler.submit_batch_job(description)
+    status = None
+    try:
+        status = scheduler.wait_until_done(job, timeout)
+    finally:
+        if status is None or not status.done:
+            scheduler.cancel_job(job)
+
+    if not status.done:
+        reason = "timed out after {} ms".format(timeout)
+    elif status.exit_code != 0:
+        reason = status.error_message or \
+            "exit code {}".format(status.exit_code)
+    else:
+        return status
+
+    raise JobError(
+        "Job {} {} failed: {}".format(
+            description.executable,
+            ' '.join(getattr(description, 'arguments', [])), reason),
+        status)
+
+
+def submit_many(scheduler, descriptions, concurrency=SUBMIT_CONCURRENCY):
+    """Submit a batch job for each of `descriptions`, with up to
+    `concurrency` submissions in flight. `descriptions` may be a generator;
+    it is consumed as submissions complete. A failed submission does not
+    stop the others.
+
+    :param scheduler: the :py:class:`xenon.Scheduler` to submit to.
+    :param descriptions: iterable of :py:class:`xenon.JobDescription`.
+    :param concurrency: maximum number of submissions in flight.
+    :return: list with, in the order of `descriptions`, the
+        :py:class:`xenon.Job` of each submission, or the exception raised if
+        it failed."""
+    slots = threading.BoundedSemaphore(concurrency)
+    futures = []
+    for description in descriptions:
+        slots.acquire()
+        try:
+            future = scheduler.submit_batch_job_async(description)
+        except Exception as e:
+            slots.release()
+            future = concurrent.futures.Future()
+            future.set_exception(e)
+        else:
+            future.add_done_callback(lambda _: slots.release())
+        futures.append(future)
+
+    return [future.exception() or future.result() for future in futures]
+
+
+def poll_until_done(scheduler, jobs, timeout=0,
+                    min_interval=MIN_POLL_INTERVAL,
+                    max_interval=MAX_POLL_INTERVAL):
+    """Poll the statuses of `jobs` until all are done or `timeout` expires.
+    After every poll, yield a dictionary mapping the indices of the jobs in
+    `jobs` to their status, for all jobs whose status was updated. Finished
+    jobs are not polled again.
+
+    :param timeout: maximum time in milliseconds, 0 to wait indefinitely."""
+    jobs = list(jobs)
+    pending = list(range(len(jobs)))
+    deadline = time.monotonic() + timeout / 1000 if timeout else None
+    interval = min_interval
+
+    while pending:
+        statuses = scheduler.get_job_statuses([jobs[i] for i in pending])
+        update = dict(zip(pending, statuses))
+        yield update
+
+        still_pending = [i for i in pending if not update[i].done]
+        if len(still_pending) < len(pending):
+            interval = min_interval
+        else:
+            interval = min(interval * 1.5, max_interval)
+        pending = still_pending
+        if not pending:
+            return
+
+        delay = interval
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            delay = min(delay, remaining)
+        time.sleep(delay)
+
+
+def wait_all(scheduler, jobs, timeout=0, **kwargs):
+    """Wait until all `jobs` are done, or `timeout` expires.
+
+    :param scheduler: the :py:class:`xenon.Scheduler` of the jobs.
+    :param jobs: iterable of :py:class:`xenon.Job`.
+    :param timeout: maximum time in milliseconds to wait, 0 to wait
+        indefinitely.
+    :return: list of the last :py:class:`xenon.JobStatus` of each job, in
+        the order of `jobs`. After a timeout, some of these are not done."""
+    jobs = list(jobs)
+    statuses = [None] * len(jobs)
+    for update in poll_until_done(scheduler, jobs, timeout, **kwargs):
+        for i, status in update.items():
+            statuses[i] = status
+    return statuses
+
+
+def wait_any(scheduler, jobs, timeout=0, **kwargs):
+    """Wait until at least one of `jobs` is done, or `timeout` expires.
+
+    :param scheduler: the :py:class:`xenon.Scheduler` of the jobs.
+    :param jobs: iterable of :py:class:`xenon.Job`.
+    :param timeout: maximum time in milliseconds to wait, 0 to wait
+        indefinitely.
+    :return: list of the :py:class:`xenon.JobStatus` of the jobs that are
+        done, in the order of `jobs`; empty after a timeout."""
+    for update in poll_until_done(scheduler, jobs, timeout, **kwargs):
+        done = [status for _, status in sorted(update.items())
+                if status.done]
+        if done:
+            return done
+    return []
+
+
+def as_completed(scheduler, jobs, timeout=0, **kwargs):
+    """Iterate over the final :py:class:`xenon.JobStatus` of `jobs`, in the
+    order in which they finish.
+
+    :param scheduler: the :py:class:`xenon.Scheduler` of the jobs.
+    :param jobs: iterable of :py:class:`xenon.Job`.
+    :param timeout: maximum time in milliseconds to wait, 0 to wait
+        indefinitely.
+    :raises concurrent.futures.TimeoutError: if not all jobs are done
+        before `timeout` expires."""
+    jobs = list(jobs)
+    remaining = len(jobs)
+    for update in poll_until_done(scheduler, jobs, timeout, **kwargs):
+        for _, status in sorted(update.items()):
+            if status.done:
+                remaining -= 1
+                yield status
+
+    if remaining:
+        raise concurrent.futures.TimeoutError(
+            "{} of {} jobs are not done.".format(remaining, len(jobs)))
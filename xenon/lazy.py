@@ -0,0 +1,23 @@
+"""
+Deferred computation of class attributes.
+"""
+
+
+class LazyAttribute(object):
+    """Class attribute that is computed on first access. This is used for
+    values that are expensive to compute while hardly ever needed, like the
+    doc-strings of the message classes, or that need modules that we don't
+    want to import before they are needed.
+
+    :ivar compute: function that computes the value.
+    :ivar args: arguments to `compute`.
+    """
+    def __init__(self, compute, *args):
+        self.compute = compute
+        self.args = args
+        self.value = None
+
+    def __get__(self, obj, objtype=None):
+        if self.value is None:
+            self.value = self.compute(*self.args)
+        return self.value
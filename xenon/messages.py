@@ -0,0 +1,157 @@
+"""
+Message classes that can be used without a connection to the Xenon-GRPC
+server. Importing this module does not import `grpc`; the generated protobuf
+module is only loaded once a message is actually needed.
+"""
+
+import pathlib
+import inspect
+import functools
+
+from .lazy import LazyAttribute
+
+try:
+    from os import PathLike
+except ImportError:
+    PathLike = object
+
+
+xenon_pb2 = None
+
+
+def get_xenon_pb2():
+    """Import the generated protobuf module on first use."""
+    global xenon_pb2
+    if xenon_pb2 is None:
+        from .proto import xenon_pb2
+    return xenon_pb2
+
+
+def job_description_fields():
+    return [f.name for f in get_xenon_pb2().JobDescription.DESCRIPTOR.fields]
+
+
+def job_description_docstring():
+    from .oop import list_attributes
+    return \
+        """This class describes a job to a Scheduler instance.\n\n""" \
+        + "\n".join(
+            ["    :ivar {0}: {0}\n    :vartype {0}: {1}\n".format(*x)
+             for x in list_attributes(
+                 get_xenon_pb2().JobDescription.DESCRIPTOR)])
+
+
+class JobDescription(object):
+    __is_proxy__ = True
+    __servicer__ = None
+    __fields__ = LazyAttribute(job_description_fields)
+
+    def __init__(self, **kwargs):
+        for k, v in kwargs.items():
+            if k not in self.__fields__:
+                raise AttributeError(
+                    "{} is not a valid field in JobDescription.".format(k))
+
+            setattr(self, k, v)
+
+    @property
+    def __wrapped__(self):
+        def get(k):
+            if k == "working_directory":
+                return str(getattr(self, k))
+            else:
+                return getattr(self, k)
+
+        args = {
+            k: get(k) for k in self.__fields__ if k in dir(self)}
+
+        return get_xenon_pb2().JobDescription(**args)
+
+
+JobDescription.__doc__ = LazyAttribute(job_description_docstring)
+
+
+class Job(object):
+    """Job.
+
+    :ivar id: the Xenon job identifyer.
+    :vartype id: string
+    """
+    __is_proxy__ = True
+    __servicer__ = None
+
+    def __init__(self, id_):
+        self.id = id_
+
+    @property
+    def __wrapped__(self):
+        return get_xenon_pb2().Job(id=self.id)
+
+
+class Path(PathLike):
+    """Wrapper around :py:class:`PurePosixPath` form the :py:mod:`pathlib`
+    module.  This class reveals a string representation of the underlying path
+    object to GRPC. You may use this class like a `pathlib.PurePosixPath`,
+    including using it as an argument to `open` calls as it derives from
+    `os.PathLike` (Python > 3.6). For more information see `the Python
+    documentation on pathlib
+    <https://docs.python.org/3/library/pathlib.html>`_."""
+    __is_proxy__ = True
+    __servicer__ = None
+
+    def __init__(self, path):
+        if isinstance(path, pathlib.PurePosixPath):
+            self._pathlib_path = path
+        elif not isinstance(path, (str, PathLike)) and \
+                isinstance(path, get_xenon_pb2().Path):
+            self._pathlib_path = pathlib.PurePosixPath(path.path)
+        else:
+            self._pathlib_path = pathlib.PurePosixPath(path)
+
+    def __str__(self):
+        return str(self._pathlib_path)
+
+    @property
+    def __wrapped__(self):
+        return get_xenon_pb2().Path(
+            path=str(self._pathlib_path),  # .__fspath__(),
+            separator='/')
+
+    def __truediv__(self, other):
+        return Path(self._pathlib_path / other)
+
+    def __fspath__(self):
+        return self._pathlib_path.__fspath__()
+
+    def __getattr__(self, attr):
+        if attr == '__wrapped__':
+            print("Warning: faulty Python behaviour.")
+            return get_xenon_pb2().Path(
+                path=str(self._pathlib_path),  # .__fspath__(),
+                separator='/')
+
+        member = getattr(self._pathlib_path, attr)
+        if inspect.ismethod(member):
+            @functools.wraps(member)
+            def wrapped_member(*args, **kwargs):
+                value = member(*args, **kwargs)
+                if isinstance(value, pathlib.PurePosixPath):
+                    return Path(value)
+                else:
+                    return value
+
+            return wrapped_member
+
+        elif isinstance(member, pathlib.PurePosixPath):
+            return Path(member)
+
+        else:
+            return member
+
+    def __dir__(self):
+        return list(set(dir(self._pathlib_path) + dir(self)))
+
+    def is_hidden(self):
+        """Checks if a file is hidden. Just compares the first character in the
+        filename with `'.'`."""
+        return self.name[0] == '.'
@@ -1,21 +1,15 @@
 from .oop import (
-    GrpcMethod, OopProxy, transform_map, mirror_enum, unwrap,
-    list_attributes, get_fields)
+    GrpcMethod, OopProxy, transform_map, mirror_enum, unwrap)
+from .messages import (JobDescription, Job, Path)  # noqa: F401
 
 from .proto import (xenon_pb2, xenon_pb2_grpc)
 from .server import __server__
 from .exceptions import make_exception
+from .jobs import (
+    SUBMIT_CONCURRENCY, as_completed, submit_many, wait_all, wait_any)
+from . import (archive, checksum, files, sweep, sync, transfer)
 
 import grpc
-import pathlib
-import inspect
-import functools
-
-try:
-    from os import PathLike
-except ImportError:
-    PathLike = object
-
 
 CopyMode = mirror_enum(xenon_pb2.CopyRequest, 'CopyMode')
 PosixFilePermission = mirror_enum(xenon_pb2, 'PosixFilePermission')
@@ -62,63 +56,14 @@ class CopyOperation(OopProxy):
     pass
 
 
-class JobDescription(object):
-    __is_proxy__ = True
-    __servicer__ = None
-    __fields__ = get_fields(xenon_pb2.JobDescription)
-
-    def __init__(self, **kwargs):
-        for k, v in kwargs.items():
-            if k not in self.__fields__:
-                raise AttributeError(
-                    "{} is not a valid field in JobDescription.".format(k))
-
-            setattr(self, k, v)
-
-    @property
-    def __wrapped__(self):
-        def get(k):
-            if k == "working_directory":
-                return str(getattr(self, k))
-            else:
-                return getattr(self, k)
-
-        args = {
-            k: get(k) for k in self.__fields__ if k in dir(self)}
-
-        return xenon_pb2.JobDescription(**args)
-
-
-JobDescription.__doc__ = \
-    """This class describes a job to a Scheduler instance.\n\n""" \
-    + "\n".join(
-            ["    :ivar {0}: {0}\n    :vartype {0}: {1}\n".format(*x)
-             for x in list_attributes(xenon_pb2.JobDescription.DESCRIPTOR)])
-
-
-class Job(object):
-    """Job.
-
-    :ivar id: the Xenon job identifyer.
-    :vartype id: string
-    """
-    __is_proxy__ = True
-    __servicer__ = None
-
-    def __init__(self, id_):
-        self.id = id_
-
-    @property
-    def __wrapped__(self):
-        return xenon_pb2.Job(id=self.id)
-
-
 class Is(OopProxy):
     def __bool__(self):
         return self.value
 
 
-def append_request_stream(self, path, data_stream):
+def append_request_stream(self, path, data_stream, min_chunk_size=None):
+    if min_chunk_size is not None:
+        data_stream = transfer.coalesce(data_stream, min_chunk_size)
     try:
         yield xenon_pb2.AppendToFileRequest(
             filesystem=unwrap(self), path=unwrap(path))
@@ -128,84 +73,19 @@ def append_request_stream(self, path, data_stream):
         raise make_exception(append_request_stream, e) from None
 
 
-def write_request_stream(self, path, data_stream):
+def write_request_stream(self, path, data_stream, size=None,
+                         min_chunk_size=None):
+    if min_chunk_size is not None:
+        data_stream = transfer.coalesce(data_stream, min_chunk_size)
     try:
         yield xenon_pb2.WriteToFileRequest(
-            filesystem=unwrap(self), path=unwrap(path))
+            filesystem=unwrap(self), path=unwrap(path), size=size)
         yield from (xenon_pb2.WriteToFileRequest(buffer=b)
                     for b in data_stream)
     except grpc.RpcError as e:
         raise make_exception(write_request_stream, e) from None
 
 
-class Path(PathLike):
-    """Wrapper around :py:class:`PurePosixPath` form the :py:mod:`pathlib`
-    module.  This class reveals a string representation of the underlying path
-    object to GRPC. You may use this class like a `pathlib.PurePosixPath`,
-    including using it as an argument to `open` calls as it derives from
-    `os.PathLike` (Python > 3.6). For more information see `the Python
-    documentation on pathlib
-    <https://docs.python.org/3/library/pathlib.html>`_."""
-    __is_proxy__ = True
-    __servicer__ = xenon_pb2_grpc.FileSystemServiceServicer
-
-    def __init__(self, path):
-        if isinstance(path, pathlib.PurePosixPath):
-            self._pathlib_path = path
-        elif isinstance(path, xenon_pb2.Path):
-            self._pathlib_path = pathlib.PurePosixPath(path.path)
-        else:
-            self._pathlib_path = pathlib.PurePosixPath(path)
-
-    def __str__(self):
-        return str(self._pathlib_path)
-
-    @property
-    def __wrapped__(self):
-        return xenon_pb2.Path(
-            path=str(self._pathlib_path),  # .__fspath__(),
-            separator='/')
-
-    def __truediv__(self, other):
-        return Path(self._pathlib_path / other)
-
-    def __fspath__(self):
-        return self._pathlib_path.__fspath__()
-
-    def __getattr__(self, attr):
-        if attr == '__wrapped__':
-            print("Warning: faulty Python behaviour.")
-            return xenon_pb2.Path(
-                path=str(self._pathlib_path),  # .__fspath__(),
-                separator='/')
-
-        member = getattr(self._pathlib_path, attr)
-        if inspect.ismethod(member):
-            @functools.wraps(member)
-            def wrapped_member(*args, **kwargs):
-                value = member(*args, **kwargs)
-                if isinstance(value, pathlib.PurePosixPath):
-                    return Path(value)
-                else:
-                    return value
-
-            return wrapped_member
-
-        elif isinstance(member, pathlib.PurePosixPath):
-            return Path(member)
-
-        else:
-            return member
-
-    def __dir__(self):
-        return list(set(dir(self._pathlib_path) + dir(self)))
-
-    def is_hidden(self):
-        """Checks if a file is hidden. Just compares the first character in the
-        filename with `'.'`."""
-        return self.name[0] == '.'
-
-
 def t_getattr(name):
     return lambda self, x: getattr(x, name)
 
@@ -291,9 +171,11 @@ class FileSystem(OopProxy):
                 'read_symbolic_link', uses_request='PathRequest',
                 output_transform=lambda self, x: Path(x)),
             GrpcMethod(
-                'write_to_file', input_transform=write_request_stream),
+                'write_to_file', input_transform=write_request_stream,
+                compressible=True),
             GrpcMethod(
-                'append_to_file', input_transform=append_request_stream),
+                'append_to_file', input_transform=append_request_stream,
+                compressible=True),
             GrpcMethod(
                 'delete', uses_request=True),
             GrpcMethod(
@@ -302,7 +184,7 @@ class FileSystem(OopProxy):
                 'set_posix_file_permissions', uses_request=True),
             GrpcMethod(
                 'list', uses_request=True,
-                output_transform=transform_map(PathAttributes)),
+                output_transform=transform_map(PathAttributes, 'list')),
 
             GrpcMethod(
                 'get_path_separator', output_transform=t_getattr('separator'))
@@ -324,6 +206,70 @@ class FileSystem(OopProxy):
     def __eq__(self, other):
         return self.__wrapped__ == other.__wrapped__
 
+    def iter_memoryviews(self, path):
+        """Read the file at `path` as :py:class:`memoryview` chunks, see
+        :py:func:`xenon.transfer.iter_memoryviews`."""
+        return transfer.iter_memoryviews(self, path)
+
+    def read_into(self, path, buffer):
+        """Read the file at `path` into `buffer`, see
+        :py:func:`xenon.transfer.read_into`."""
+        return transfer.read_into(self, path, buffer)
+
+    def download(self, path, local_path, max_pending=64, verify=None,
+                 algorithm='sha256'):
+        """Download the file at `path` to `local_path`, see
+        :py:func:`xenon.transfer.download`."""
+        return transfer.download(
+            self, path, local_path, max_pending, verify, algorithm)
+
+    def download_many(self, paths, max_workers=8, max_pending=64,
+                      verify=None, algorithm='sha256'):
+        """Download many `(path, local_path)` pairs concurrently, see
+        :py:func:`xenon.transfer.download_many`."""
+        return transfer.download_many(
+            self, paths, max_workers, max_pending, verify, algorithm)
+
+    def upload(self, local_path, path, chunk_size=transfer.CHUNK_SIZE,
+               verify=None, algorithm='sha256'):
+        """Upload the file at `local_path` to `path`, see
+        :py:func:`xenon.transfer.upload`."""
+        return transfer.upload(
+            self, local_path, path, chunk_size, verify, algorithm)
+
+    def upload_many(self, paths, max_workers=8,
+                    chunk_size=transfer.CHUNK_SIZE, verify=None,
+                    algorithm='sha256'):
+        """Upload many `(local_path, path)` pairs concurrently, see
+        :py:func:`xenon.transfer.upload_many`."""
+        return transfer.upload_many(
+            self, paths, max_workers, chunk_size, verify, algorithm)
+
+    def sync_tree(self, src, dst_filesystem, dst, max_workers=8,
+                  manifest=None, incremental=False, delete=False):
+        """Copy the directory tree at `src` to `dst` on `dst_filesystem`,
+        or the local disk if that is `None`. See
+        :py:func:`xenon.sync.sync_tree`."""
+        return sync.sync_tree(
+            self, src, dst_filesystem, dst, max_workers, manifest,
+            incremental, delete)
+
+    def upload_tree(self, local_dir, dst, max_workers=8, manifest=None,
+                    incremental=False, delete=False):
+        """Copy the local directory tree at `local_dir` to `dst` on this
+        file system. See :py:func:`xenon.sync.sync_tree`."""
+        return sync.sync_tree(
+            None, local_dir, self, dst, max_workers, manifest, incremental,
+            delete)
+
+    def open(self, path, mode='rb', buffering=-1, encoding=None,
+             errors=None, newline=None, max_pending=16, size=None):
+        """Open the file at `path`, returning a file object. See
+        :py:func:`xenon.files.open_remote`."""
+        return files.open_remote(
+            self, path, mode, buffering, encoding, errors, newline,
+            max_pending, size)
+
 
 def input_request_stream(self, description, stdin_stream):
     try:
@@ -434,3 +380,61 @@ class Scheduler(OopProxy):
 
     def __exit__(self, exc_type, exc_value, exc_tb):
         self.close()
+
+    def submit_many(self, descriptions, concurrency=SUBMIT_CONCURRENCY):
+        """Submit many batch jobs, with several submissions in flight. See
+        :py:func:`xenon.jobs.submit_many`."""
+        return submit_many(self, descriptions, concurrency)
+
+    def submit_sweep(self, template, parameters,
+                     concurrency=SUBMIT_CONCURRENCY):
+        """Submit a batch job for every combination of `parameters`, see
+        :py:func:`xenon.sweep.expand` and :py:meth:`submit_many`.
+
+        :return: list of :py:class:`Job` or exceptions, in the order of
+            :py:func:`xenon.sweep.grid`."""
+        return submit_many(
+            self, sweep.expand(template, parameters), concurrency)
+
+    def submit_array(self, template, n_tasks):
+        """Submit `template` as a native array job of `n_tasks` tasks, see
+        :py:func:`xenon.sweep.array_job`.
+
+        :return: a pair of the :py:class:`Job` and the name of the
+            environment variable holding the task index."""
+        description, variable = sweep.array_job(
+            template, n_tasks, self.get_adaptor_name())
+        return self.submit_batch_job(description), variable
+
+    def wait_all(self, jobs, timeout=0, **kwargs):
+        """Wait until all `jobs` are done, polling their statuses together.
+        See :py:func:`xenon.jobs.wait_all`."""
+        return wait_all(self, jobs, timeout, **kwargs)
+
+    def wait_any(self, jobs, timeout=0, **kwargs):
+        """Wait until one of `jobs` is done. See
+        :py:func:`xenon.jobs.wait_any`."""
+        return wait_any(self, jobs, timeout, **kwargs)
+
+    def as_completed(self, jobs, timeout=0, **kwargs):
+        """Iterate over the final statuses of `jobs` as they finish. See
+        :py:func:`xenon.jobs.as_completed`."""
+        return as_completed(self, jobs, timeout, **kwargs)
+
+    def checksum(self, path, algorithm='sha256', timeout=0):
+        """Compute the checksum of the file at `path` on the file system of
+        this scheduler, using a batch job. See
+        :py:func:`xenon.checksum.remote_checksum`."""
+        return checksum.remote_checksum(self, path, algorithm, timeout)
+
+    def upload_archive(self, local_dir, remote_dir, timeout=0):
+        """Upload the local directory `local_dir` to `remote_dir` on the
+        file system of this scheduler, as a single tar archive. See
+        :py:func:`xenon.archive.upload_archive`."""
+        return archive.upload_archive(self, local_dir, remote_dir, timeout)
+
+    def download_archive(self, remote_dir, local_dir, timeout=0):
+        """Download `remote_dir` on the file system of this scheduler to the
+        local directory `local_dir`, as a single tar archive. See
+        :py:func:`xenon.archive.download_archive`."""
+        return archive.download_archive(self, remote_dir, local_dir, timeout)
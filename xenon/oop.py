@@ -1,8 +1,16 @@
 from .proto import xenon_pb2
 from .server import __server__
 from .exceptions import make_exception
+from .lazy import LazyAttribute
+from google.protobuf import descriptor_pb2
+import concurrent.futures
 import grpc
 
+try:
+    from collections.abc import (Iterable, Mapping)
+except ImportError:
+    from collections import (Iterable, Mapping)
+
 
 try:
     from enum import Enum
@@ -66,6 +74,25 @@ def get_field_description(f):
         return type_name.lower()
 
 
+_service_protos = {}
+
+
+def get_method_descriptor(servicer, method):
+    """Get the `MethodDescriptorProto` of a `GrpcMethod` in the service
+    implemented by `servicer`. This tells whether the call is streaming.
+    The descriptors are read from the serialized `.proto` file, since the
+    generated service descriptors do not always carry this information."""
+    if not _service_protos:
+        file_proto = descriptor_pb2.FileDescriptorProto.FromString(
+            xenon_pb2.DESCRIPTOR.serialized_pb)
+        _service_protos.update(
+            (s.name, {m.name: m for m in s.method})
+            for s in file_proto.service)
+
+    service_name = servicer.__name__[:-len('Servicer')]
+    return _service_protos[service_name][to_lower_camel_case(method.name)]
+
+
 def list_attributes(msg_type):
     """List all attributes with type description of a GRPC Message class."""
     return [(f.name, get_field_description(f))
@@ -84,22 +111,42 @@ class GrpcMethod:
         method's arguments.
     :ivar output_transform: custom method to extract the return value from
         the return value.
+    :ivar client_streaming: whether the request is a stream, set by `OopMeta`
+        from the service description.
+    :ivar server_streaming: whether the response is a stream, set by `OopMeta`
+        from the service description.
+    :ivar request_builder: function building the request from the method's
+        arguments, compiled by `OopMeta`.
+    :ivar compressible: whether the requests of this method carry file
+        contents, which are compressed if the server's
+        :py:class:`ChannelConfig` asks for it. Only what the client sends
+        can be compressed this way.
     """
     def __init__(self, name, uses_request=False, field_name=None,
                  input_transform=None, output_transform=None,
-                 static=False):
+                 static=False, compressible=False):
         self.name = name
         self.uses_request = uses_request
         self.field_name = field_name
         self.input_transform = input_transform
         self.output_transform = output_transform
         self.static = static
+        self.compressible = compressible
+        self.client_streaming = None
+        self.server_streaming = None
+        self.request_builder = None
+        self._signature = None
 
     @property
     def is_simple(self):
         return not self.uses_request and not self.input_transform \
             and not self.static
 
+    @property
+    def is_unary(self):
+        """True if neither the request nor the response is a stream."""
+        return not self.client_streaming and not self.server_streaming
+
     @property
     def request_name(self):
         """Generate the name of the request."""
@@ -133,6 +180,12 @@ class GrpcMethod:
         if not use_signature:
             raise NotImplementedError("Python 3 only.")
 
+        if self._signature is None:
+            self._signature = self._make_signature()
+
+        return self._signature
+
+    def _make_signature(self):
         if self.static:
             parameters = \
                 (Parameter(name='cls',
@@ -185,67 +238,72 @@ def unwrap(arg):
         return arg
 
 
-def make_static_request(method, *args, **kwargs):
-    """Creates a request from a static method function call."""
-    if args and not use_signature:
-        raise NotImplementedError("Only keyword arguments allowed in Python2")
-
-    if use_signature:
-        new_kwargs = {kw: unwrap(value) for kw, value in kwargs.items()}
-        new_args = tuple(unwrap(value) for value in args)
-        bound_args = method.signature.bind(
-            None, *new_args, **new_kwargs).arguments
+def translate_argument(arg):
+    """Prepare an argument for use in a GRPC message: proxies are unwrapped
+    and `Enum` values replaced by their value, also inside sequences."""
+    arg = unwrap(arg)
+    if isinstance(arg, Enum):
+        return arg.value
+    if isinstance(arg, (str, bytes, Mapping)) or not isinstance(arg, Iterable):
+        return arg
+    return [translate_argument(x) for x in arg]
 
-        # if we encounter any Enum arguments, replace them with their value
-        for k in bound_args:
-            if isinstance(bound_args[k], Enum):
-                bound_args[k] = bound_args[k].value
 
-        new_kwargs = {kw: v for kw, v in bound_args.items() if kw != 'cls'}
+def compile_request_builder(method):
+    """Creates a function that builds the request message of `method` from
+    the arguments of a method call. All the work that only depends on the
+    `GrpcMethod` definition is done here, once, so that building a request
+    is not much more expensive than constructing the message itself.
 
-    else:
-        new_kwargs = {kw: unwrap(value) for kw, value in kwargs.items()}
+    The resulting function takes `self` (ignored for static methods) followed
+    by the arguments of the call."""
+    request_type = method.request_type
+    fields = get_fields(request_type)
+    self_field = None if method.static else method.field_name
+    if self_field is not None:
+        if self_field not in fields:
+            raise NameError("field '{}' not found in {}".format(
+                self_field, method.request_name))
+        fields.remove(self_field)
 
-    return method.request_type(**new_kwargs)
+    fields = tuple(fields)
+    field_set = frozenset(fields)
+    n_fields = len(fields)
 
+    def build_request(self, *args, **kwargs):
+        if len(args) > n_fields:
+            raise TypeError("{}() takes at most {} arguments ({} given)"
+                            .format(method.name, n_fields, len(args)))
 
-def make_request(self, method, *args, **kwargs):
-    """Creates a request from a method function call."""
-    if args and not use_signature:
-        raise NotImplementedError("Only keyword arguments allowed in Python2")
+        request = {}
+        for name, value in zip(fields, args):
+            request[name] = translate_argument(value)
 
-    new_kwargs = {kw: unwrap(value) for kw, value in kwargs.items()}
+        for name, value in kwargs.items():
+            if name not in field_set:
+                raise TypeError("{}() got an unexpected keyword argument '{}'"
+                                .format(method.name, name))
+            if name in request:
+                raise TypeError("{}() got multiple values for argument '{}'"
+                                .format(method.name, name))
+            request[name] = translate_argument(value)
 
-    if use_signature:
-        new_args = tuple(unwrap(value) for value in args)
-        bound_args = method.signature.bind(
-            unwrap(self), *new_args, **new_kwargs).arguments
+        if self_field is not None:
+            request[self_field] = unwrap(self)
 
-        # if we encounter any Enum arguments, replace them with their value
-        def translate_enum(arg):
-            return arg.value if isinstance(arg, Enum) else arg
+        return request_type(**request)
 
-        for k in bound_args:
-            if isinstance(bound_args[k], str):
-                continue
-            if isinstance(bound_args[k], dict):
-                continue
+    return build_request
 
-            try:
-                x = [translate_enum(arg) for arg in bound_args[k]]
-                bound_args[k] = x
-            except TypeError:
-                bound_args[k] = translate_enum(bound_args[k])
 
-        # replace `self` with the correct keyword
-        new_kwargs = {(kw if kw != 'self' else method.field_name): v
-                      for kw, v in bound_args.items()}
-        # args = tuple(x.value if isinstance(x, Enum) else x for x in args)
+def make_static_request(method, *args, **kwargs):
+    """Creates a request from a static method function call."""
+    return method.request_builder(None, *args, **kwargs)
 
-    else:
-        new_kwargs[self.field_name] = unwrap(self)
 
-    return method.request_type(**new_kwargs)
+def make_request(self, method, *args, **kwargs):
+    """Creates a request from a method function call."""
+    return method.request_builder(self, *args, **kwargs)
 
 
 def apply_transform(service, t, x):
@@ -256,17 +314,31 @@ def apply_transform(service, t, x):
         return t(service, x)
 
 
-def transform_map(f):
+def transform_map(f, name):
+    """Output transformation applying `f` to every item of a streamed
+    response of the method `name`. Errors raised while iterating are
+    translated as in `grpc_call`."""
     def t(self, xs):
-        return (f(self, x) for x in xs)
+        try:
+            yield from (f(self, x) for x in xs)
+        except grpc.RpcError as e:
+            raise make_exception(t, e) from None
 
+    t.__name__ = name
     return t
 
 
+def call_options(method):
+    """Keyword arguments for the GRPC call of `method`."""
+    if method.compressible and __server__.channel_config.compress_files:
+        return {'compression': grpc.Compression.Gzip}
+    return {}
+
+
 def grpc_call(service, method, request):
     f = getattr(service, to_lower_camel_case(method.name))
     try:
-        result = f(request)
+        result = f(request, **call_options(method))
     except grpc.RpcError as e:
         raise make_exception(method, e) from None
 
@@ -316,6 +388,128 @@ def method_wrapper(m):
         return request_method
 
 
+def grpc_future(service, method, request):
+    """Start a unary GRPC call, returning a `concurrent.futures.Future` that
+    resolves to the transformed output of the call. Errors are translated
+    to the same exceptions as those raised by `grpc_call`."""
+    call = getattr(service, to_lower_camel_case(method.name)).future(
+        request, **call_options(method))
+    future = concurrent.futures.Future()
+
+    def call_done(call):
+        if call.cancelled():
+            future.cancel()
+            return
+
+        # the future may have been cancelled while the call completed
+        if not future.set_running_or_notify_cancel():
+            return
+
+        try:
+            result = apply_transform(
+                service, method.output_transform, call.result())
+        except grpc.RpcError as e:
+            future.set_exception(make_exception(method, e))
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def future_done(future):
+        if future.cancelled():
+            call.cancel()
+
+    future.add_done_callback(future_done)
+    call.add_done_callback(call_done)
+    return future
+
+
+def future_method_wrapper(m):
+    """Generates a method returning a `concurrent.futures.Future` from a
+    unary `GrpcMethod` definition."""
+
+    if m.is_simple:
+        def simple_method(self):
+            """TODO: no docstring!"""
+            return grpc_future(self.__service__, m, unwrap(self))
+
+        return simple_method
+
+    elif m.input_transform is not None:
+        def transform_method(self, *args, **kwargs):
+            """TODO: no docstring!"""
+            request = m.input_transform(self, *args, **kwargs)
+            return grpc_future(self.__service__, m, request)
+
+        return transform_method
+
+    elif m.static:
+        def static_method(cls, *args, **kwargs):
+            """TODO: no docstring!"""
+            request = make_static_request(m, *args, **kwargs)
+            return grpc_future(cls.__stub__(__server__), m, request)
+
+        return static_method
+
+    else:
+        def request_method(self, *args, **kwargs):
+            """TODO: no docstring!"""
+            request = make_request(self, m, *args, **kwargs)
+            return grpc_future(self.__service__, m, request)
+
+        return request_method
+
+
+def future_docstring(m):
+    return "Asynchronous version of :py:meth:`{}`, returning a " \
+        "`concurrent.futures.Future` for its result.".format(m.name)
+
+
+def message_docstring(doc, descriptor):
+    """Generate a class doc-string, listing the attributes of the wrapped
+    message."""
+    if doc is None:
+        doc = "Wrapped proto message."
+    doc += "\n\n"
+    for attr in list_attributes(descriptor):
+        doc += "    :ivar {0}: {0}\n    :vartype {0}: {1}\n".format(*attr)
+    return doc
+
+
+class LazyMethod(object):
+    """Descriptor for a method generated from a `GrpcMethod`. The signature
+    and doc-string of the method are only computed on first access, after
+    which the method replaces this descriptor in the class.
+
+    :ivar owner: the class to which the method belongs.
+    :ivar function: the generated method.
+    :ivar method: the `GrpcMethod` definition.
+    :ivar docstring: function that renders the doc-string.
+    """
+    def __init__(self, owner, function, method, docstring):
+        self.owner = owner
+        self.function = function
+        self.method = method
+        self.docstring = docstring
+
+    def resolve(self):
+        """Render signature and doc-string, and install the method in
+        the owning class."""
+        f = self.function
+        if use_signature:
+            f.__signature__ = self.method.signature
+        doc = self.docstring()
+        if doc is not None:
+            f.__doc__ = doc
+
+        wrapped = classmethod(f) if self.method.static else f
+        setattr(self.owner, f.__name__, wrapped)
+        return wrapped
+
+    def __get__(self, obj, objtype=None):
+        return self.resolve().__get__(obj, objtype)
+
+
 class OopMeta(type):
     """Meta class for Grpc Object wrappers."""
     def __new__(cls, name, parents, dct):
@@ -328,31 +522,30 @@ class OopMeta(type):
             if m.uses_request and not m.field_name:
                 m.field_name = cls.__field_name__
 
-            f = method_wrapper(m)
-            if use_signature:
-                f.__signature__ = m.signature
-
             if cls.__servicer__:
-                f.__doc__ = m.docstring(cls.__servicer__)
+                descriptor = get_method_descriptor(cls.__servicer__, m)
+                m.client_streaming = descriptor.client_streaming
+                m.server_streaming = descriptor.server_streaming
 
-            f.__name__ = m.name
+            if m.request_type is not None and m.input_transform is None:
+                m.request_builder = compile_request_builder(m)
 
-            if m.static:
-                setattr(cls, m.name, classmethod(f))
-            else:
-                setattr(cls, m.name, f)
+            f = cls.__method_wrapper__(m)
+            f.__name__ = m.name
+            setattr(cls, m.name, LazyMethod(
+                cls, f, m, lambda m=m: m.docstring(cls.__servicer__)
+                if cls.__servicer__ else None))
 
-        try:
-            grpc_cls = getattr(xenon_pb2, name)
-            if cls.__doc__ is None:
-                cls.__doc__ = "Wrapped proto message."
-            cls.__doc__ += "\n\n"
-            for attr in list_attributes(grpc_cls.DESCRIPTOR):
-                cls.__doc__ += \
-                    "    :ivar {0}: {0}\n    :vartype {0}: {1}\n".format(*attr)
+            if cls.__future_wrapper__ and m.is_unary:
+                g = cls.__future_wrapper__(m)
+                g.__name__ = m.name + '_async'
+                setattr(cls, g.__name__, LazyMethod(
+                    cls, g, m, lambda m=m: future_docstring(m)))
 
-        except AttributeError:
-            pass
+        grpc_cls = getattr(xenon_pb2, name, None)
+        if grpc_cls is not None:
+            cls.__doc__ = LazyAttribute(
+                message_docstring, cls.__doc__, grpc_cls.DESCRIPTOR)
 
 
 class OopProxy(metaclass=OopMeta):
@@ -370,11 +563,18 @@ class OopProxy(metaclass=OopMeta):
         should be bound in a request. This can be overridden by specifying
         the `field_name` property in the `GRPCMethod` definition. For a
         well-designed API this should not be necessary though.
+    :ivar __method_wrapper__: Function that generates a method from a
+        `GrpcMethod` definition.
+    :ivar __future_wrapper__: Function that generates the `<name>_async`
+        companion of a unary `GrpcMethod`, or `None` if no such methods should
+        be generated.
     """
 
     __is_proxy__ = True
     __servicer__ = None
     __field_name__ = None
+    __method_wrapper__ = staticmethod(method_wrapper)
+    __future_wrapper__ = staticmethod(future_method_wrapper)
 
     @classmethod
     def __methods__(cls):
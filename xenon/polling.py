@@ -0,0 +1,371 @@
+"""
+Batched polling of job statuses.
+
+Every call to :py:meth:`xenon.Scheduler.get_job_status` is a round trip to
+the server, and usually a query of the underlying scheduler (``squeue``,
+``qstat``, ...). A :py:class:`JobStatusPoller` collects the status queries
+of all threads, answers them with one
+:py:meth:`xenon.Scheduler.get_job_statuses` call per `interval`, and serves
+repeated queries from a cache.
+
+A :py:class:`JobWatcher` polls all jobs it watches in bulk, and reports
+changes of their state to callbacks or an `asyncio` event loop.
+"""
+
+import concurrent.futures
+import logging
+import threading
+import time
+
+
+class JobStatusPoller(object):
+    """Answers job status queries with batched calls to
+    :py:meth:`xenon.Scheduler.get_job_statuses`. Statuses are cached for
+    `ttl` seconds; a query for a job without a recent enough status waits
+    for the next batch. Batches are sent by a background thread, at most
+    once every `interval` seconds.
+
+    :param scheduler: the :py:class:`xenon.Scheduler` of the jobs.
+    :param ttl: time in seconds that a status is served from the cache.
+    :param interval: minimum time in seconds between two batches.
+    """
+    def __init__(self, scheduler, ttl=5.0, interval=1.0):
+        self.scheduler = scheduler
+        self.ttl = ttl
+        self.interval = interval
+
+        self.condition = threading.Condition()
+        self.cache = {}
+        self.errors = {}
+        self.pending = {}
+        self.in_flight = set()
+        self.last_poll = None
+        self.closed = False
+        self.thread = None
+
+    def _is_fresh(self, job_id, now):
+        entry = self.cache.get(job_id)
+        return entry is not None and now - entry[0] <= self.ttl
+
+    def _start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._loop, daemon=True)
+            self.thread.start()
+
+    def get_statuses(self, jobs):
+        """Get the statuses of `jobs`, waiting for the next batch for those
+        that are not in the cache.
+
+        :param jobs: list of :py:class:`xenon.Job`.
+        :return: list of :py:class:`xenon.JobStatus`, in the order of
+            `jobs`."""
+        jobs = list(jobs)
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Job status poller is closed.")
+
+            requested = time.monotonic()
+            # keep the fresh statuses, the cache may change while waiting
+            statuses = {job.id: self.cache[job.id][1] for job in jobs
+                        if self._is_fresh(job.id, requested)}
+            missing = {job.id: job for job in jobs
+                       if job.id not in statuses}
+            if missing:
+                self.pending.update(missing)
+                self._start()
+                self.condition.notify_all()
+
+            while True:
+                for job_id in missing:
+                    error = self.errors.get(job_id)
+                    if error is not None and error[0] >= requested:
+                        raise error[1]
+
+                for job_id in list(missing):
+                    entry = self.cache.get(job_id)
+                    if entry is not None and entry[0] >= requested:
+                        statuses[job_id] = entry[1]
+                        del missing[job_id]
+
+                if not missing:
+                    return [statuses[job.id] for job in jobs]
+
+                # a status that was invalidated before we woke up is queried
+                # again
+                lost = {job_id: job for job_id, job in missing.items()
+                        if job_id not in self.pending and
+                        job_id not in self.in_flight}
+                if lost:
+                    self.pending.update(lost)
+                    self.condition.notify_all()
+
+                if self.closed:
+                    raise RuntimeError("Job status poller is closed.")
+                self.condition.wait()
+
+    def get_status(self, job):
+        """Get the status of a single `job`, see :py:meth:`get_statuses`.
+
+        :return: a :py:class:`xenon.JobStatus`."""
+        return self.get_statuses([job])[0]
+
+    def invalidate(self, job):
+        """Remove the cached status of `job`, e.g. after cancelling it."""
+        with self.condition:
+            self.cache.pop(job.id, None)
+
+    def _next_batch(self):
+        """Wait until there are queries and `interval` has passed since the
+        last batch; return the queried jobs, or `None` when closed."""
+        with self.condition:
+            while not self.closed:
+                now = time.monotonic()
+                if self.pending:
+                    delay = 0 if self.last_poll is None \
+                        else self.last_poll + self.interval - now
+                    if delay <= 0:
+                        batch, self.pending = self.pending, {}
+                        self.in_flight = set(batch)
+                        self.last_poll = now
+                        return now, batch
+                    self.condition.wait(delay)
+                else:
+                    self.condition.wait()
+            return None, None
+
+    def _loop(self):
+        while True:
+            started, batch = self._next_batch()
+            if batch is None:
+                return
+
+            try:
+                statuses = self.scheduler.get_job_statuses(
+                    list(batch.values()))
+            except Exception as e:
+                with self.condition:
+                    for job_id in batch:
+                        self.errors[job_id] = (started, e)
+                    self.in_flight = set()
+                    self.condition.notify_all()
+                continue
+
+            with self.condition:
+                expired = [job_id for job_id, (t, _) in self.cache.items()
+                           if started - t > self.ttl + self.interval]
+                for job_id in expired:
+                    del self.cache[job_id]
+                    self.errors.pop(job_id, None)
+
+                for job_id, status in zip(batch, statuses):
+                    self.cache[job_id] = (started, status)
+                    self.errors.pop(job_id, None)
+                self.in_flight = set()
+                self.condition.notify_all()
+
+    def close(self):
+        """Stop the background thread. Waiting queries raise
+        `RuntimeError`."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+
+class JobWatcher(object):
+    """Tracks many jobs with a single polling thread, and reports changes
+    of their state. Every `interval` seconds, the statuses of all watched
+    jobs are fetched with :py:meth:`xenon.Scheduler.get_job_statuses`, in
+    batches of at most `batch_size` jobs. Whenever the `state` of a job
+    changes, the listeners are called with the job, its new
+    :py:class:`xenon.JobStatus` and its previous state (`None` the first
+    time). Jobs that are done are no longer watched.
+
+    Listeners are called from the polling thread; use :py:meth:`events` to
+    receive the changes in an `asyncio` event loop instead. Call it before
+    watching jobs to receive all their changes.
+
+    :param scheduler: the :py:class:`xenon.Scheduler` of the jobs.
+    :param interval: time in seconds between two polls.
+    :param batch_size: maximum number of jobs per `get_job_statuses` call.
+    """
+    def __init__(self, scheduler, interval=5.0, batch_size=1000):
+        self.scheduler = scheduler
+        self.interval = interval
+        self.batch_size = batch_size
+
+        self.condition = threading.Condition()
+        self.jobs = {}
+        self.listeners = []
+        self._close_listeners = []
+        self.closed = False
+        self.thread = None
+
+    def add_listener(self, callback):
+        """Call `callback(job, status, previous_state)` on every change of
+        state of a watched job."""
+        with self.condition:
+            self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self.condition:
+            self.listeners.remove(callback)
+
+    def watch(self, job, callback=None):
+        """Start watching `job`. Watching a job that is already watched
+        adds `callback` to those of the job, and returns the same future.
+
+        :param callback: called as `callback(job, status, previous_state)`
+            on changes of state of this job only.
+        :return: a `concurrent.futures.Future` resolving to the final
+            :py:class:`xenon.JobStatus`. In an event loop, it can be awaited
+            after wrapping it with `asyncio.wrap_future`."""
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Job watcher is closed.")
+            watched = self.jobs.get(job.id)
+            if watched is None:
+                watched = WatchedJob(job)
+                self.jobs[job.id] = watched
+            elif watched.future.cancelled():
+                watched.future = concurrent.futures.Future()
+            if callback is not None:
+                watched.callbacks.append(callback)
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._loop, daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+            return watched.future
+
+    def unwatch(self, job):
+        """Stop watching `job`; its future is cancelled."""
+        with self.condition:
+            watched = self.jobs.pop(job.id, None)
+        if watched is not None:
+            watched.future.cancel()
+
+    def events(self):
+        """Asynchronous iterator over the changes of state, as tuples
+        `(job, status, previous_state)`, delivered to the current event
+        loop. See :py:class:`xenon.events.JobEvents`; the iterator receives
+        changes from the moment this method is called."""
+        from .events import JobEvents
+        return JobEvents(self)
+
+    def _subscribe(self, listener, close_listener):
+        """Add `listener`, and pass it the last known status of every
+        watched job."""
+        with self.condition:
+            if self.closed:
+                close_listener()
+                return
+            self.listeners.append(listener)
+            self._close_listeners.append(close_listener)
+            for watched in self.jobs.values():
+                if watched.status is not None:
+                    listener(watched.job, watched.status, None)
+
+    def _unsubscribe(self, listener, close_listener):
+        with self.condition:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+            if close_listener in self._close_listeners:
+                self._close_listeners.remove(close_listener)
+
+    def _poll(self):
+        with self.condition:
+            watched = list(self.jobs.values())
+
+        logger = logging.getLogger('xenon')
+        for i in range(0, len(watched), self.batch_size):
+            batch = watched[i:i + self.batch_size]
+            try:
+                statuses = self.scheduler.get_job_statuses(
+                    [w.job for w in batch])
+            except Exception as e:
+                logger.warning("Polling job statuses failed: {}".format(e))
+                continue
+
+            for w, status in zip(batch, statuses):
+                self._update(w, status)
+
+    def _update(self, watched, status):
+        previous = watched.state
+        if status.state == previous and not status.done:
+            return
+
+        with self.condition:
+            watched.state = status.state
+            watched.status = status
+            listeners = list(self.listeners) + watched.callbacks
+            future = watched.future
+            if status.done:
+                self.jobs.pop(watched.job.id, None)
+
+        if status.state != previous:
+            for listener in listeners:
+                try:
+                    listener(watched.job, status, previous)
+                except Exception:
+                    logging.getLogger('xenon').exception(
+                        "Exception in job watcher callback.")
+
+        # the future may have been cancelled by `unwatch`
+        if status.done and future.set_running_or_notify_cancel():
+            future.set_result(status)
+
+    def _loop(self):
+        while True:
+            with self.condition:
+                while not self.jobs and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+
+            self._poll()
+
+            with self.condition:
+                if not self.closed:
+                    self.condition.wait(self.interval)
+
+    def close(self):
+        """Stop watching all jobs. Their futures are cancelled, and
+        iterators from :py:meth:`events` end."""
+        with self.condition:
+            self.closed = True
+            watched, self.jobs = list(self.jobs.values()), {}
+            close_listeners = list(self._close_listeners)
+            self.condition.notify_all()
+
+        for w in watched:
+            w.future.cancel()
+        for close_listener in close_listeners:
+            close_listener()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+
+class WatchedJob(object):
+    """A job watched by a :py:class:`JobWatcher`, with its callbacks, its
+    future, and its last known state and status."""
+    def __init__(self, job):
+        self.job = job
+        self.callbacks = []
+        self.future = concurrent.futures.Future()
+        self.state = None
+        self.status = None
@@ -0,0 +1,203 @@
+"""
+Pool of pre-started Xenon-GRPC servers.
+
+Starting the Java based Xenon-GRPC server takes seconds. A
+:py:class:`ServerPool` starts servers ahead of demand, so that
+:py:func:`xenon.init` can take one that is ready to accept connections::
+
+    pool = ServerPool(size=2)
+    ...
+    xenon.init(pool=pool)
+
+Every server taken from the pool is replaced in the background. Idle servers
+are checked periodically and replaced if they died.
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+from .compat import (start_xenon_server, kill_process)
+from .server import (
+    check_port, find_free_port, print_stream, wait_for_server)
+
+
+class WarmServer(object):
+    """A started Xenon-GRPC server, ready to accept connections.
+
+    :ivar process: the server process.
+    :ivar port: the port on which the server listens.
+    :ivar crt_file: certificate of the server, `None` if TLS is disabled.
+    :ivar key_file: key of the server, `None` if TLS is disabled.
+    """
+    def __init__(self, process, port, crt_file, key_file):
+        self.process = process
+        self.port = port
+        self.crt_file = crt_file
+        self.key_file = key_file
+
+    def is_healthy(self):
+        """Checks that the server is running and accepting connections."""
+        return self.process.poll() is None and check_port(self.port)
+
+    def kill(self):
+        if self.process.poll() is None:
+            kill_process(self.process)
+
+
+def start_warm_server(disable_tls=False, startup_timeout=60.0):
+    """Start a Xenon-GRPC server on a free port and wait at most
+    `startup_timeout` seconds until it accepts connections."""
+    port = find_free_port()
+    process, crt_file, key_file = start_xenon_server(port, disable_tls)
+
+    for name, output in [('out', process.stdout), ('err', process.stderr)]:
+        threading.Thread(
+            target=print_stream, args=(output, name), daemon=True).start()
+
+    try:
+        wait_for_server(port, process, crt_file, key_file, startup_timeout)
+    except Exception:
+        if process.poll() is None:
+            kill_process(process)
+        raise
+
+    return WarmServer(process, port, crt_file, key_file)
+
+
+class ServerPool(object):
+    """Keeps `size` Xenon-GRPC servers started ahead of demand.
+
+    :param size: number of idle servers to keep ready.
+    :param disable_tls: start the servers without TLS.
+    :param health_interval: time in seconds between health checks of idle
+        servers.
+    :param startup_timeout: maximum time in seconds to wait for a server to
+        accept connections.
+    """
+    def __init__(self, size=1, disable_tls=False, health_interval=10.0,
+                 startup_timeout=60.0):
+        self.size = size
+        self.disable_tls = disable_tls
+        self.health_interval = health_interval
+        self.startup_timeout = startup_timeout
+
+        self.condition = threading.Condition()
+        self.idle = []
+        self.starting = 0
+        self.error = None
+        self.closed = False
+
+        self._replenish()
+
+        self.health_thread = threading.Thread(
+            target=self._health_loop, daemon=True)
+        self.health_thread.start()
+        atexit.register(self.close)
+
+    def _replenish(self):
+        """Start servers until `size` servers are idle or starting."""
+        with self.condition:
+            if self.closed:
+                return
+
+            missing = self.size - len(self.idle) - self.starting
+            self.starting += max(missing, 0)
+
+        for _ in range(missing):
+            threading.Thread(target=self._start, daemon=True).start()
+
+    def _start(self):
+        logger = logging.getLogger('xenon')
+        error = None
+        try:
+            server = start_warm_server(self.disable_tls, self.startup_timeout)
+        except Exception as e:
+            logger.warning("Could not start pooled Xenon-GRPC server: {}"
+                           .format(e))
+            server = None
+            error = e
+
+        with self.condition:
+            self.starting -= 1
+            self.error = error
+            if server is not None and self.closed:
+                server.kill()
+            elif server is not None:
+                self.idle.append(server)
+            self.condition.notify_all()
+
+    def _remove_unhealthy(self):
+        with self.condition:
+            unhealthy = [s for s in self.idle if not s.is_healthy()]
+            self.idle = [s for s in self.idle if s not in unhealthy]
+
+        for server in unhealthy:
+            server.kill()
+
+    def _health_loop(self):
+        while not self.closed:
+            time.sleep(self.health_interval)
+            self._remove_unhealthy()
+            self._replenish()
+
+    def acquire(self, timeout=None):
+        """Take a running server from the pool, waiting for one to start if
+        none is ready. The caller is responsible for stopping the server.
+        If no server is starting, one more is started; if that fails, its
+        error is raised.
+
+        :param timeout: maximum time in seconds to wait for a server.
+        :return: a :py:class:`WarmServer`
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        retried = False
+
+        while True:
+            self._remove_unhealthy()
+            with self.condition:
+                if self.closed:
+                    raise RuntimeError("Server pool is closed.")
+
+                if self.idle:
+                    server = self.idle.pop(0)
+                    break
+
+                # if nothing is starting, the previous attempt failed
+                retry = self.starting == 0
+                if retry and retried and self.error is not None:
+                    raise self.error
+
+            if retry:
+                retried = True
+                self._replenish()
+
+            with self.condition:
+                remaining = None if deadline is None \
+                    else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise RuntimeError(
+                        "No Xenon-GRPC server became available in time.")
+                if not self.idle and not self.closed:
+                    self.condition.wait(remaining)
+
+        self._replenish()
+        return server
+
+    def close(self):
+        """Stop all idle servers. Servers that were acquired from the pool
+        are not affected."""
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.condition.notify_all()
+
+        for server in idle:
+            server.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
@@ -2,9 +2,13 @@
 GRPC server connection.
 """
 
+import asyncio
 import atexit
+import itertools
 import logging
+import os
 import socket
+import stat
 import threading
 import time
 
@@ -23,19 +27,238 @@ def check_socket(host, port):
         return sock.connect_ex((host, port)) == 0
 
 
-def get_secure_channel(crt_file, key_file, port=50051):
-    """Try to connect over a secure channel."""
+def check_port(port):
+    """Checks if the Xenon-GRPC server is listening on `port` of this
+    host."""
+    return check_socket(socket.gethostname(), port)
+
+
+def check_unix_socket(socket_path):
+    """Checks that `socket_path` is a socket that only the current user can
+    connect to. Connections over a Unix domain socket are not encrypted and
+    not authenticated by GRPC; access is controlled by the file permissions
+    instead.
+
+    :return: `False` if there is no socket at `socket_path`.
+    :raises RuntimeError: if the socket is accessible to other users."""
+    try:
+        info = os.stat(str(socket_path))
+    except FileNotFoundError:
+        return False
+
+    if not stat.S_ISSOCK(info.st_mode):
+        raise RuntimeError("{} is not a socket.".format(socket_path))
+
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise RuntimeError(
+            "Socket {} is accessible to other users; it should be owned by "
+            "you and have mode 0600.".format(socket_path))
+
+    return True
 
-    creds = grpc.ssl_channel_credentials(
+
+def get_channel_credentials(crt_file, key_file):
+    """Create channel credentials from a (self-signed) certificate."""
+    return grpc.ssl_channel_credentials(
         root_certificates=open(str(crt_file), 'rb').read(),
         private_key=open(str(key_file), 'rb').read(),
         certificate_chain=open(str(crt_file), 'rb').read())
 
+
+# While the server is starting, connection attempts are refused. GRPC retries
+# with exponential backoff, starting at one second by default; we start at
+# 20 ms so that we notice quickly when the server comes up.
+reconnect_options = [
+    ('grpc.initial_reconnect_backoff_ms', 20),
+    ('grpc.min_reconnect_backoff_ms', 20),
+    ('grpc.max_reconnect_backoff_ms', 1000)]
+
+
+class ChannelConfig(object):
+    """Options for the GRPC channels to the Xenon-GRPC server. Options that
+    are `None` keep the GRPC default.
+
+    :ivar max_send_message_length: largest message the client sends, in
+        bytes.
+    :ivar max_receive_message_length: largest message the client accepts,
+        in bytes (GRPC default: 4 MB).
+    :ivar initial_window_size: initial HTTP/2 flow-control window of a
+        stream, in bytes.
+    :ivar bdp_probe: whether GRPC grows the flow-control windows to the
+        measured bandwidth-delay product.
+    :ivar keepalive_time: interval in seconds between keepalive pings. Note
+        that by default the server refuses pings more often than every five
+        minutes.
+    :ivar keepalive_timeout: time in seconds to wait for a ping to be
+        acknowledged before the connection is closed.
+    :ivar keepalive_without_calls: also send keepalive pings when no calls
+        are active, e.g. to keep long-idle scheduler connections open.
+    :ivar compress_files: compress file contents sent to the server by
+        `write_to_file` and `append_to_file` with gzip. The server decides on
+        compression of its responses, so data received by `read_from_file`
+        is not affected.
+    """
+    def __init__(self, max_send_message_length=None,
+                 max_receive_message_length=None, initial_window_size=None,
+                 bdp_probe=None, keepalive_time=None, keepalive_timeout=None,
+                 keepalive_without_calls=False, compress_files=False):
+        self.max_send_message_length = max_send_message_length
+        self.max_receive_message_length = max_receive_message_length
+        self.initial_window_size = initial_window_size
+        self.bdp_probe = bdp_probe
+        self.keepalive_time = keepalive_time
+        self.keepalive_timeout = keepalive_timeout
+        self.keepalive_without_calls = keepalive_without_calls
+        self.compress_files = compress_files
+
+    def options(self):
+        """The GRPC channel arguments for this configuration."""
+        def ms(seconds):
+            return int(seconds * 1000)
+
+        options = []
+        if self.max_send_message_length is not None:
+            options.append(('grpc.max_send_message_length',
+                            self.max_send_message_length))
+        if self.max_receive_message_length is not None:
+            options.append(('grpc.max_receive_message_length',
+                            self.max_receive_message_length))
+        if self.initial_window_size is not None:
+            options.append(('grpc.http2.lookahead_bytes',
+                            self.initial_window_size))
+        if self.bdp_probe is not None:
+            options.append(('grpc.http2.bdp_probe', int(self.bdp_probe)))
+        if self.keepalive_time is not None:
+            options.append(('grpc.keepalive_time_ms',
+                            ms(self.keepalive_time)))
+        if self.keepalive_timeout is not None:
+            options.append(('grpc.keepalive_timeout_ms',
+                            ms(self.keepalive_timeout)))
+        if self.keepalive_without_calls:
+            options.extend([
+                ('grpc.keepalive_permit_without_calls', 1),
+                ('grpc.http2.max_pings_without_data', 0)])
+        return options
+
+
+# GRPC shares connections between channels with the same arguments. Channels
+# in a pool need their own connection, so each gets a private subchannel pool.
+pooled_channel_options = [
+    ('grpc.use_local_subchannel_pool', 1)]
+
+
+def get_secure_channel(crt_file, key_file, port=50051, options=()):
+    """Try to connect over a secure channel."""
+    creds = get_channel_credentials(crt_file, key_file)
     address = "{}:{}".format(socket.gethostname(), port)
-    channel = grpc.secure_channel(address, creds)
+    channel = grpc.secure_channel(
+        address, creds, options=reconnect_options + list(options))
     return channel
 
 
+def get_channel(port, crt_file=None, key_file=None, options=()):
+    """Create a channel to the server on `port`. If no certificate is
+    given, the channel is insecure."""
+    if crt_file is None:
+        return grpc.insecure_channel(
+            '{}:{}'.format(socket.gethostname(), port),
+            options=reconnect_options + list(options))
+
+    return get_secure_channel(crt_file, key_file, port, options)
+
+
+def get_unix_channel(socket_path, options=()):
+    """Create an insecure channel to the server listening on the Unix domain
+    socket `socket_path`."""
+    return grpc.insecure_channel(
+        'unix:{}'.format(socket_path),
+        options=reconnect_options + list(options))
+
+
+def wait_until_ready(channel, process=None, timeout=60.0):
+    """Wait until `channel` is connected to the server. If the server
+    `process` is given, stop waiting when it exits.
+
+    :param timeout: maximum time in seconds to wait."""
+    ready = grpc.channel_ready_future(channel)
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError("GRPC started, but still can't connect.")
+
+            try:
+                ready.result(timeout=min(remaining, 0.5))
+                return
+            except grpc.FutureTimeoutError:
+                pass
+
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(
+                    "GRPC server exited with code {}.".format(
+                        process.returncode))
+    finally:
+        ready.cancel()
+
+
+def wait_for_server(port, process=None, crt_file=None, key_file=None,
+                    timeout=60.0):
+    """Wait until the server on `port` accepts GRPC connections."""
+    channel = get_channel(port, crt_file, key_file)
+    try:
+        wait_until_ready(channel, process, timeout)
+    finally:
+        channel.close()
+
+
+def get_aio_channel(crt_file=None, key_file=None, port=50051,
+                    socket_path=None, options=()):
+    """Create a `grpc.aio` channel. If no certificate is given, the
+    channel is insecure. If `socket_path` is given, the channel connects to
+    that Unix domain socket instead of `port`. This has to be called from
+    within a running event loop."""
+    options = list(options)
+    if socket_path is not None:
+        return grpc.aio.insecure_channel(
+            'unix:{}'.format(socket_path), options=options)
+
+    address = "{}:{}".format(socket.gethostname(), port)
+    if crt_file is None:
+        return grpc.aio.insecure_channel(address, options=options)
+
+    creds = get_channel_credentials(crt_file, key_file)
+    return grpc.aio.secure_channel(address, creds, options=options)
+
+
+class StubPool(object):
+    """Spreads calls over stubs of the same service, each bound to its own
+    channel. Attribute access is forwarded to the next stub in turn, so a
+    :py:class:`StubPool` can be used wherever a stub is expected.
+
+    :param stubs: list of stubs.
+    :param thread_affinity: if `True`, every thread keeps using the same stub,
+        instead of taking the next stub for every call.
+    """
+    def __init__(self, stubs, thread_affinity=False):
+        self.stubs = stubs
+        self.thread_affinity = thread_affinity
+        self._counter = itertools.count()
+        self._local = threading.local()
+
+    def next_stub(self):
+        if not self.thread_affinity:
+            return self.stubs[next(self._counter) % len(self.stubs)]
+
+        index = getattr(self._local, 'index', None)
+        if index is None:
+            index = self._local.index = next(self._counter)
+        return self.stubs[index % len(self.stubs)]
+
+    def __getattr__(self, name):
+        return getattr(self.next_stub(), name)
+
+
 def find_free_port():
     """Finds a free port."""
     with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as sock:
@@ -53,13 +276,34 @@ def print_stream(file, name):
 class Server(object):
     """Xenon Server. This tries to find a running Xenon-GRPC server,
     or start one if not found. This implementation may only work on Unix.
+
+    If `socket_path` is given, the server is not started, but reached over
+    the Unix domain socket at that path.
+
+    With `channels` larger than one, several connections to the server are
+    opened and calls are spread over them by a :py:class:`StubPool`.
+
+    The channels are configured by a :py:class:`ChannelConfig`.
     """
-    def __init__(self, port=50051, disable_tls=False):
+    def __init__(self, port=50051, disable_tls=False, startup_timeout=60.0,
+                 socket_path=None, channels=1, thread_affinity=False,
+                 channel_config=None):
         self.port = port
+        self.channel_config = channel_config or ChannelConfig()
+        self.socket_path = socket_path
+        self.startup_timeout = startup_timeout
+        self.n_channels = channels
+        self.thread_affinity = thread_affinity
         self.process = None
         self.channel = None
+        self.channels = []
+        self.aio_channels = {}
+        self.aio_lock = threading.Lock()
         self.threads = []
         self.disable_tls = disable_tls
+        self.crt_file = None
+        self.key_file = None
+        self.daemon_client = None
 
         # Xenon proxies
         self.scheduler_stub = None
@@ -68,11 +312,24 @@ class Server(object):
     def __enter__(self):
         logger = logging.getLogger('xenon')
 
-        if check_socket(socket.gethostname(), self.port):
+        if self.socket_path is not None:
+            if not check_unix_socket(self.socket_path):
+                raise RuntimeError(
+                    "No Xenon-GRPC server listening on {}."
+                    .format(self.socket_path))
+
+            logger.info('Connecting to server on {}'.format(self.socket_path))
+            self._connect()
+            return self
+
+        if check_port(self.port):
             logger.info('Xenon-GRPC servers seems to be running.')
+            if not self.disable_tls and self.crt_file is None:
+                from .create_keys import create_self_signed_cert
+                self.crt_file, self.key_file = create_self_signed_cert()
         else:
             logger.info('Starting Xenon-GRPC server.')
-            self.process, crt_file, key_file = \
+            self.process, self.crt_file, self.key_file = \
                 start_xenon_server(self.port, self.disable_tls)
 
             for name, output in [('out', self.process.stdout),
@@ -83,37 +340,125 @@ class Server(object):
                     daemon=True)
                 thread.start()
 
-            for _ in range(50):
-                if check_socket(socket.gethostname(), self.port):
-                    break
-                time.sleep(0.1)
-            else:
-                raise RuntimeError("GRPC started, but still can't connect.")
-
         logger.info('Connecting to server')
-        if self.disable_tls:
-            self.channel = grpc.insecure_channel(
-                '{}:{}'.format(socket.gethostname(), self.port))
+        self._connect()
+        return self
+
+    def _open_channel(self, options=()):
+        options = self.channel_config.options() + list(options)
+        if self.socket_path is not None:
+            return get_unix_channel(self.socket_path, options)
+        elif self.disable_tls:
+            return get_channel(self.port, options=options)
+        else:
+            return get_channel(
+                self.port, self.crt_file, self.key_file, options)
+
+    def _connect(self):
+        """Open the channels, wait until they are connected and create the
+        stubs."""
+        if self.n_channels > 1:
+            self.channels = [self._open_channel(pooled_channel_options)
+                             for _ in range(self.n_channels)]
         else:
-            self.channel = get_secure_channel(crt_file, key_file, self.port)
+            self.channels = [self._open_channel()]
+
+        for channel in self.channels:
+            wait_until_ready(channel, self.process, self.startup_timeout)
+        self.channel = self.channels[0]
+
+        if len(self.channels) == 1:
+            self.file_system_stub = \
+                xenon_pb2_grpc.FileSystemServiceStub(self.channel)
+            self.scheduler_stub = \
+                xenon_pb2_grpc.SchedulerServiceStub(self.channel)
+            return
+
+        self.file_system_stub = StubPool(
+            [xenon_pb2_grpc.FileSystemServiceStub(c) for c in self.channels],
+            self.thread_affinity)
+        self.scheduler_stub = StubPool(
+            [xenon_pb2_grpc.SchedulerServiceStub(c) for c in self.channels],
+            self.thread_affinity)
+
+    def _get_aio_stubs(self):
+        """Return the `grpc.aio` channel of the current event loop, with
+        its file system and scheduler stubs. A `grpc.aio` channel cannot be
+        used from another event loop than the one it was created in, so a
+        channel is kept per loop. Channels of loops that have been closed
+        are dropped; they are released when garbage collected."""
+        loop = asyncio.get_event_loop()
+        with self.aio_lock:
+            for stale in [other for other in self.aio_channels
+                          if other.is_closed()]:
+                del self.aio_channels[stale]
+
+            if loop not in self.aio_channels:
+                options = self.channel_config.options()
+                if self.socket_path is not None:
+                    channel = get_aio_channel(
+                        socket_path=self.socket_path, options=options)
+                elif self.disable_tls:
+                    channel = get_aio_channel(
+                        port=self.port, options=options)
+                else:
+                    channel = get_aio_channel(
+                        self.crt_file, self.key_file, self.port,
+                        options=options)
+                self.aio_channels[loop] = (
+                    channel,
+                    xenon_pb2_grpc.FileSystemServiceStub(channel),
+                    xenon_pb2_grpc.SchedulerServiceStub(channel))
+
+            return self.aio_channels[loop]
+
+    def _close_aio_channels(self):
+        """Close the `grpc.aio` channels of all loops that are still open.
+        The channels of running loops are closed asynchronously."""
+        with self.aio_lock:
+            channels = list(self.aio_channels.items())
+            self.aio_channels.clear()
+
+        for loop, (channel, _, _) in channels:
+            if loop.is_closed():
+                continue
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(channel.close(), loop)
+            else:
+                loop.run_until_complete(channel.close())
 
-        self.file_system_stub = \
-            xenon_pb2_grpc.FileSystemServiceStub(self.channel)
-        self.scheduler_stub = \
-            xenon_pb2_grpc.SchedulerServiceStub(self.channel)
-        return self
+    @property
+    def aio_file_system_stub(self):
+        """File system stub bound to the `grpc.aio` channel of the current
+        event loop."""
+        return self._get_aio_stubs()[1]
+
+    @property
+    def aio_scheduler_stub(self):
+        """Scheduler stub bound to the `grpc.aio` channel of the current
+        event loop."""
+        return self._get_aio_stubs()[2]
 
     def __exit__(self, exc_type, exc_value, exc_tb):
         if self.process:
             kill_process(self.process)
 
+        if self.daemon_client:
+            self.daemon_client.detach()
+
         self.process = None
+        self.daemon_client = None
+        self.socket_path = None
+        self._close_aio_channels()
 
 
 __server__ = Server()
 
 
-def init(port=None, do_not_exit=False, disable_tls=False, log_level='WARNING'):
+def init(port=None, do_not_exit=False, disable_tls=False, log_level='WARNING',
+         daemon=False, idle_timeout=600, pool=None, startup_timeout=60.0,
+         socket_path=None, channels=1, thread_affinity=False,
+         channel_config=None):
     """Start the Xenon GRPC server on the specified port, or, if a service
     is already running on that port, connect to that.
 
@@ -124,7 +469,30 @@ def init(port=None, do_not_exit=False, disable_tls=False, log_level='WARNING'):
     :param port: the port number
     :param do_not_exit: by default the GRPC server is shut down after Python
         exits (through the `atexit` module), setting this value to `True` will
-        prevent that from happening."""
+        prevent that from happening.
+    :param daemon: share a single server between all Python processes of this
+        user, see :py:mod:`xenon.daemon`. A running daemon is found through
+        the XDG runtime directory; if there is none, it is started. On exit,
+        this process detaches from the daemon instead of stopping it.
+    :param idle_timeout: time in seconds that a newly started daemon keeps
+        running after the last process detached.
+    :param pool: a :py:class:`xenon.pool.ServerPool`; if given, a server that
+        is already running is taken from the pool. Its TLS setting overrides
+        `disable_tls`.
+    :param startup_timeout: maximum time in seconds to wait for the server to
+        accept connections.
+    :param socket_path: connect to a Xenon-GRPC server listening on this Unix
+        domain socket, instead of using TCP. No server is started and TLS is
+        not used; the socket has to be owned by the current user and may not
+        be accessible to others.
+    :param channels: number of connections to open to the server. Calls,
+        including streaming transfers, are spread over the connections, so
+        that parallel transfers are not limited by a single HTTP/2
+        connection.
+    :param thread_affinity: with more than one channel, let every thread use
+        the same connection for all its calls.
+    :param channel_config: a :py:class:`ChannelConfig` with options for the
+        channels."""
     logger = logging.getLogger('xenon')
     logger.setLevel(logging.INFO)
 
@@ -133,16 +501,47 @@ def init(port=None, do_not_exit=False, disable_tls=False, log_level='WARNING'):
     logger_handler.setLevel(getattr(logging, log_level))
     logger.addHandler(logger_handler)
 
-    if port is None:
-        port = find_free_port()
-
-    if __server__.process is not None:
+    if __server__.process is not None or \
+            __server__.daemon_client is not None or \
+            __server__.socket_path is not None:
         logger.warning(
             "You tried to run init(), but the server is already running.")
         return __server__
 
+    __server__.n_channels = channels
+    if channel_config is not None:
+        __server__.channel_config = channel_config
+    __server__.thread_affinity = thread_affinity
+
+    if socket_path is not None:
+        __server__.socket_path = socket_path
+        __server__.startup_timeout = startup_timeout
+        __server__.__enter__()
+        return __server__
+
+    if daemon:
+        from .daemon import attach
+        client = attach(port=port, disable_tls=disable_tls,
+                        idle_timeout=idle_timeout)
+        __server__.daemon_client = client
+        __server__.crt_file = client.crt_file
+        __server__.key_file = client.key_file
+        port = client.port
+
+    if pool is not None:
+        warm_server = pool.acquire(startup_timeout)
+        __server__.process = warm_server.process
+        __server__.crt_file = warm_server.crt_file
+        __server__.key_file = warm_server.key_file
+        disable_tls = pool.disable_tls
+        port = warm_server.port
+
+    if port is None:
+        port = find_free_port()
+
     __server__.port = port
     __server__.disable_tls = disable_tls
+    __server__.startup_timeout = startup_timeout
     __server__.__enter__()
 
     if not do_not_exit:
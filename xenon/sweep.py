@@ -0,0 +1,94 @@
+"""
+Parameter sweeps.
+
+A sweep runs the same job for every combination of values in a parameter
+grid. :py:func:`expand` generates a :py:class:`xenon.JobDescription` per
+combination from a template, in which the fields may refer to the
+parameters in the syntax of :py:meth:`str.format`, e.g.
+``arguments=['--size', '{size}']``. The descriptions are generated lazily,
+so that :py:meth:`xenon.Scheduler.submit_many` can submit them without
+building them all first.
+
+Schedulers that support array jobs can run a sweep as a single job instead,
+see :py:func:`array_job`. Each task of an array job finds its index in an
+environment variable, and has to look up its parameters itself.
+"""
+
+import itertools
+
+from .messages import JobDescription
+
+
+# Scheduler arguments submitting an array job of `n` tasks, and the
+# environment variable holding the index of a task, per adaptor. Grid Engine
+# numbers tasks from 1, the others from 0.
+array_job_adaptors = {
+    'slurm': (lambda n: ['--array=0-{}'.format(n - 1)],
+              'SLURM_ARRAY_TASK_ID'),
+    'gridengine': (lambda n: ['-t', '1-{}'.format(n)], 'SGE_TASK_ID'),
+    'torque': (lambda n: ['-t', '0-{}'.format(n - 1)], 'PBS_ARRAYID')}
+
+
+def grid(parameters):
+    """Iterate over all combinations of parameter values, as dictionaries.
+    The last parameter varies fastest.
+
+    :param parameters: dictionary mapping parameter names to iterables of
+        values."""
+    names = list(parameters)
+    for values in itertools.product(*(parameters[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def fill_in(value, parameters):
+    """Substitute `parameters` in a field of a job description. Strings are
+    formatted; lists and dictionaries of strings are formatted item by
+    item; other values are returned as they are."""
+    if isinstance(value, str):
+        return value.format(**parameters)
+    if isinstance(value, dict):
+        return {k: fill_in(v, parameters) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [fill_in(v, parameters) for v in value]
+    return value
+
+
+def expand(template, parameters):
+    """Generate a job description for every combination of parameter values,
+    in the order of :py:func:`grid`.
+
+    :param template: a :py:class:`xenon.JobDescription` whose string fields
+        may contain ``{name}`` references to the parameters. Literal braces
+        have to be doubled.
+    :param parameters: dictionary mapping parameter names to iterables of
+        values.
+    :return: generator of :py:class:`xenon.JobDescription`."""
+    fields = dict(vars(template))
+    for values in grid(parameters):
+        yield JobDescription(**{
+            k: fill_in(v, values) for k, v in fields.items()})
+
+
+def array_job(template, n_tasks, adaptor):
+    """Make a single array job of `n_tasks` tasks from `template`, for
+    schedulers with native array jobs.
+
+    :param template: the :py:class:`xenon.JobDescription` of every task.
+    :param n_tasks: the number of tasks.
+    :param adaptor: the name of the scheduler adaptor, see
+        :py:meth:`xenon.Scheduler.get_adaptor_name`.
+    :return: a pair of the :py:class:`xenon.JobDescription` of the array job
+        and the name of the environment variable holding the task index.
+    :raises ValueError: if the adaptor has no array jobs."""
+    if adaptor not in array_job_adaptors:
+        raise ValueError(
+            "Array jobs are not supported by the '{}' adaptor.".format(
+                adaptor))
+    if n_tasks < 1:
+        raise ValueError("An array job needs at least one task.")
+
+    arguments, variable = array_job_adaptors[adaptor]
+    fields = dict(vars(template))
+    fields['scheduler_arguments'] = \
+        list(fields.get('scheduler_arguments', [])) + arguments(n_tasks)
+    return JobDescription(**fields), variable
@@ -0,0 +1,323 @@
+"""
+Synchronisation of directory trees.
+
+:py:func:`sync_tree` copies a directory tree from a Xenon file system to
+another file system or to the local disk, or from the local disk to a Xenon
+file system. Files are transferred concurrently, streaming through this
+process. Only regular files and directories are copied; symbolic links and
+special files are skipped with a warning. Progress can be recorded in
+a :py:class:`Manifest`, so that an interrupted synchronisation skips the
+files that were already transferred when it is restarted.
+
+In incremental mode, the destination tree is listed as well, and only files
+that are new or changed are transferred. As Xenon cannot set modification
+times, a destination file is considered up to date if it has the same size
+and was modified after the source file. Optionally, files and directories
+that do not exist in the source are deleted from the destination.
+"""
+
+import json
+import logging
+import os
+import posixpath
+import shutil
+import threading
+
+from pathlib import PurePosixPath
+from stat import S_ISREG
+
+from .exceptions import (
+    PathAlreadyExistsException, NoSuchPathException)
+from .messages import Path
+from . import transfer
+
+
+class Manifest(object):
+    """Record of the files that have been transferred, kept in a local file
+    with one JSON object per line. A file is only skipped if its size and
+    modification time are still the same as when it was transferred.
+
+    :param path: the local path of the manifest; if it exists, it is read
+        and extended.
+    """
+    def __init__(self, path):
+        self.path = str(path)
+        self.entries = {}
+        self.lock = threading.Lock()
+
+        complete = True
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    complete = line.endswith('\n')
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # last line may be cut off by an interruption
+                        continue
+                    self.entries[entry['path']] = \
+                        (entry['size'], entry['mtime'])
+
+        self.file = open(self.path, 'a')
+        if not complete:
+            self.file.write('\n')
+
+    def is_done(self, path, size, mtime):
+        """Checks if the file at relative `path` was transferred with the
+        given size and modification time."""
+        return self.entries.get(path) == (size, mtime)
+
+    def add(self, path, size, mtime):
+        """Record that the file at relative `path` was transferred."""
+        with self.lock:
+            self.entries[path] = (size, mtime)
+            self.file.write(json.dumps(
+                {'path': path, 'size': size, 'mtime': mtime}) + '\n')
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.close()
+
+
+def skip(path):
+    logging.getLogger('xenon').warning(
+        "Skipping {}: only regular files and directories are synchronised."
+        .format(path))
+
+
+def absolute_path(filesystem, path):
+    """The normalised absolute form of `path`; relative paths are relative
+    to the working directory of `filesystem`, or of this process if that is
+    `None`."""
+    if filesystem is None:
+        return os.path.abspath(str(path))
+    path = str(path)
+    if not posixpath.isabs(path):
+        path = posixpath.join(str(filesystem.get_working_directory()), path)
+    return posixpath.normpath(path)
+
+
+def list_tree(filesystem, path):
+    """List the tree below `path` with a single recursive `list` call.
+
+    :return: a pair of dictionaries mapping relative paths of directories
+        and of regular files to their :py:class:`PathAttributes`."""
+    base = absolute_path(filesystem, path)
+    directories = {}
+    files = {}
+    for attributes in filesystem.list(Path(base), recursive=True):
+        relative = str(PurePosixPath(str(attributes.path))
+                       .relative_to(base))
+        if attributes.is_symbolic_link:
+            skip(attributes.path)
+        elif attributes.is_directory:
+            directories[relative] = attributes
+        elif attributes.is_regular:
+            files[relative] = attributes
+        else:
+            skip(attributes.path)
+    return directories, files
+
+
+def list_local_tree(path):
+    """List the tree below the local directory `path`.
+
+    :return: a pair of a set of relative paths of directories and a
+        dictionary mapping relative paths of regular files to their size and
+        modification time in milliseconds."""
+    directories = set()
+    files = {}
+    for root, dirs, names in os.walk(path):
+        relative_root = os.path.relpath(root, path)
+        for name in list(dirs):
+            if os.path.islink(os.path.join(root, name)):
+                skip(os.path.join(root, name))
+                dirs.remove(name)
+                continue
+            directories.add(
+                str(PurePosixPath(relative_root, name)))
+        for name in names:
+            stat = os.lstat(os.path.join(root, name))
+            if not S_ISREG(stat.st_mode):
+                skip(os.path.join(root, name))
+                continue
+            files[str(PurePosixPath(relative_root, name))] = \
+                (stat.st_size, int(stat.st_mtime * 1000))
+    return directories, files
+
+
+def list_files(filesystem, path):
+    """List the tree below `path` on `filesystem`, or on the local disk if
+    that is `None`, in the format of :py:func:`list_local_tree`."""
+    if filesystem is None:
+        return list_local_tree(path)
+
+    directories, files = list_tree(filesystem, path)
+    return set(directories), {
+        relative: (attributes.size, attributes.last_modified_time)
+        for relative, attributes in files.items()}
+
+
+def list_destination(filesystem, path):
+    """List the destination tree in the format of
+    :py:func:`list_local_tree`. A destination that does not exist is
+    empty."""
+    try:
+        return list_files(filesystem, path)
+    except NoSuchPathException:
+        return set(), {}
+
+
+def is_up_to_date(source, destination):
+    """Checks if the destination file is up to date with the source file,
+    both given by their size and modification time, or `None` if the
+    destination does not exist."""
+    if destination is None:
+        return False
+    return destination[0] == source[0] and destination[1] >= source[1]
+
+
+def top_level(paths):
+    """The paths that are not below another path in `paths`, as a set."""
+    paths = set(paths)
+    return {p for p in paths
+            if not any(str(parent) in paths
+                       for parent in PurePosixPath(p).parents)}
+
+
+def delete_path(filesystem, path, recursive):
+    """Delete `path`, on the local disk if `filesystem` is `None`."""
+    if filesystem is None:
+        if recursive:
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    else:
+        filesystem.delete(Path(path), recursive=recursive)
+
+
+def leaf_directories(directories):
+    """The directories that are not the parent of another directory.
+    Creating these creates the whole tree."""
+    parents = {str(parent) for d in directories
+               for parent in PurePosixPath(d).parents}
+    return sorted(d for d in directories if d not in parents)
+
+
+def make_directories(filesystem, path):
+    """Create the directory `path` with its parents, on the local disk if
+    `filesystem` is `None`."""
+    if filesystem is None:
+        os.makedirs(path, exist_ok=True)
+        return
+
+    try:
+        filesystem.create_directories(Path(path))
+    except PathAlreadyExistsException:
+        pass
+
+
+def copy_file(src_filesystem, src, dst_filesystem, dst, size):
+    """Stream the file `src` to `dst`, replacing `dst` if it exists. If
+    `src_filesystem` or `dst_filesystem` is `None`, that path is local."""
+    if dst_filesystem is None:
+        transfer.download(src_filesystem, src, dst)
+        return
+
+    def write():
+        if src_filesystem is None:
+            transfer.upload(dst_filesystem, src, dst)
+        else:
+            dst_filesystem.write_to_file(
+                Path(dst), src_filesystem.read_from_file(Path(src)),
+                size=size)
+
+    try:
+        write()
+    except PathAlreadyExistsException:
+        dst_filesystem.delete(Path(dst), recursive=False)
+        write()
+
+
+def sync_tree(src_filesystem, src, dst_filesystem, dst, max_workers=8,
+              manifest=None, incremental=False, delete=False):
+    """Copy the directory tree at `src` to `dst`. Symbolic links and
+    special files are not copied.
+
+    :param src_filesystem: the :py:class:`xenon.FileSystem` to copy from, or
+        `None` to copy from the local disk.
+    :param src: the directory to copy.
+    :param dst_filesystem: the :py:class:`xenon.FileSystem` to copy to, or
+        `None` to copy to the local disk. Source and destination cannot both
+        be local.
+    :param dst: the destination directory; it is created if needed.
+    :param max_workers: maximum number of concurrent transfers.
+    :param manifest: local path of a :py:class:`Manifest`. Files recorded in
+        the manifest are skipped, and transferred files are added to it.
+    :param incremental: only transfer files that are missing or changed in
+        the destination.
+    :param delete: delete files and directories from the destination that
+        do not exist in the source.
+    :return: the relative paths of the transferred files."""
+    if src_filesystem is None and dst_filesystem is None:
+        raise ValueError("Source and destination are both local.")
+
+    src = absolute_path(src_filesystem, src)
+    if src_filesystem is None and not os.path.isdir(src):
+        raise FileNotFoundError("No such directory: {}".format(src))
+    dst = str(dst)
+    src_join = os.path.join if src_filesystem is None else posixpath.join
+    join = os.path.join if dst_filesystem is None else posixpath.join
+
+    directories, files = list_files(src_filesystem, src)
+    if incremental or delete:
+        dst_directories, dst_files = list_destination(dst_filesystem, dst)
+    manifest = Manifest(manifest) if manifest is not None else None
+
+    try:
+        if delete:
+            extra_directories = top_level(
+                dst_directories - set(directories))
+            extra_files = [
+                path for path in dst_files
+                if path not in files and not any(
+                    str(parent) in extra_directories
+                    for parent in PurePosixPath(path).parents)]
+            transfer.run_all(
+                lambda path, recursive: delete_path(
+                    dst_filesystem, join(dst, path), recursive),
+                [(d, True) for d in sorted(extra_directories)] +
+                [(f, False) for f in sorted(extra_files)],
+                max_workers)
+
+        transfer.run_all(
+            lambda d: make_directories(
+                dst_filesystem, join(dst, d) if d else dst),
+            [(d,) for d in leaf_directories(directories) or ['']],
+            max_workers)
+
+        todo = [(path, source)
+                for path, source in sorted(files.items())
+                if (manifest is None or not manifest.is_done(path, *source))
+                and not (incremental and is_up_to_date(
+                    source, dst_files.get(path)))]
+
+        def transfer_file(path, source):
+            copy_file(src_filesystem, src_join(src, path),
+                      dst_filesystem, join(dst, path), source[0])
+            if manifest is not None:
+                manifest.add(path, *source)
+
+        transfer.run_all(transfer_file, todo, max_workers)
+
+    finally:
+        if manifest is not None:
+            manifest.close()
+
+    return [path for path, _ in todo]
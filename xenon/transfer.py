@@ -0,0 +1,244 @@
+"""
+Transfer of whole files between the local disk and a Xenon file system.
+
+These functions are available as methods of :py:class:`xenon.FileSystem`.
+Transfers of many files run concurrently in a thread pool; combine this with
+``xenon.init(channels=...)`` to spread the streams over several connections.
+"""
+
+import concurrent.futures
+import os
+import queue
+import threading
+
+from .messages import Path
+from . import checksum
+
+
+# Size of the messages sent when uploading. Larger messages mean less
+# overhead per byte, but should stay well below the 4 MB message size limit
+# of the server.
+CHUNK_SIZE = 1 << 20
+
+# Suggested `min_chunk_size` for `write_to_file` and `append_to_file` when
+# streaming many small pieces of data.
+COALESCE_SIZE = 1 << 16
+
+
+def run_all(function, items, max_workers):
+    """Call `function(*item)` for every item in a thread pool. When a call
+    fails, the calls that have not started yet are cancelled and the first
+    exception is raised.
+
+    :return: list of results, in the order of `items`."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        futures = [executor.submit(function, *item) for item in items]
+        done, _ = concurrent.futures.wait(
+            futures, return_when=concurrent.futures.FIRST_EXCEPTION)
+        for future in futures:
+            future.cancel()
+
+    for future in futures:
+        if future in done and future.exception() is not None:
+            raise future.exception()
+    return [future.result() for future in futures]
+
+
+def coalesce(chunks, min_size=COALESCE_SIZE):
+    """Combine small `chunks` of bytes into chunks of at least `min_size`
+    bytes, except for the last one. Chunks that are large enough are passed
+    on as they are."""
+    pending = bytearray()
+    for chunk in chunks:
+        if not pending and len(chunk) >= min_size:
+            yield chunk
+            continue
+
+        pending += chunk
+        if len(pending) >= min_size:
+            yield bytes(pending)
+            pending.clear()
+
+    if pending:
+        yield bytes(pending)
+
+
+def read_chunks(file, chunk_size=CHUNK_SIZE):
+    """Read `file` in chunks of `chunk_size` bytes."""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_behind(chunks, file, max_pending):
+    """Write `chunks` to `file` from a separate thread, so that receiving
+    the next chunk overlaps with writing the previous one. At most
+    `max_pending` chunks are buffered.
+
+    :return: the number of bytes written."""
+    pending = queue.Queue(max_pending)
+    errors = []
+
+    def writer():
+        try:
+            while True:
+                chunk = pending.get()
+                if chunk is None:
+                    return
+                file.write(chunk)
+        except Exception as e:
+            errors.append(e)
+            # unblock the reader
+            while pending.get() is not None:
+                pass
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+
+    size = 0
+    try:
+        for chunk in chunks:
+            if errors:
+                break
+            pending.put(chunk)
+            size += len(chunk)
+    finally:
+        pending.put(None)
+        thread.join()
+
+    if errors:
+        raise errors[0]
+    return size
+
+
+def iter_memoryviews(filesystem, path):
+    """Read the file at `path`, yielding a :py:class:`memoryview` of each
+    received chunk. Slicing the views does not copy data.
+
+    :param filesystem: the :py:class:`xenon.FileSystem` to read from.
+    :param path: the remote path."""
+    for chunk in filesystem.read_from_file(Path(path)):
+        yield memoryview(chunk)
+
+
+def read_into(filesystem, path, buffer):
+    """Read the file at `path` into `buffer`, which may be any writable
+    object supporting the buffer protocol, e.g. a :py:class:`bytearray`,
+    :py:class:`mmap.mmap` or :py:class:`memoryview`. Each received chunk is
+    copied once, directly to its place in `buffer`.
+
+    :param filesystem: the :py:class:`xenon.FileSystem` to read from.
+    :param path: the remote path.
+    :param buffer: the buffer to fill from the start.
+    :return: the number of bytes read.
+    :raises ValueError: if the file does not fit in `buffer`."""
+    target = memoryview(buffer).cast('B')
+    offset = 0
+    for chunk in iter_memoryviews(filesystem, path):
+        end = offset + len(chunk)
+        if end > len(target):
+            raise ValueError(
+                "File {} does not fit in a buffer of {} bytes."
+                .format(path, len(target)))
+        target[offset:end] = chunk
+        offset = end
+    return offset
+
+
+def download(filesystem, path, local_path, max_pending=64, verify=None,
+             algorithm='sha256'):
+    """Download the file at `path` to `local_path`. Received data is
+    written to disk while the next chunks are received. If the transfer
+    fails, the partially written local file is removed.
+
+    :param filesystem: the :py:class:`xenon.FileSystem` to read from.
+    :param path: the remote path.
+    :param local_path: the local path.
+    :param max_pending: maximum number of chunks waiting to be written.
+    :param verify: a :py:class:`xenon.Scheduler` sharing the file system. If
+        given, the checksum of the received data is compared with the
+        checksum computed by a job on this scheduler, see
+        :py:func:`xenon.checksum.remote_checksum`.
+    :param algorithm: the checksum algorithm used for verification.
+    :return: the number of bytes transferred."""
+    local_path = str(local_path)
+    stream = filesystem.read_from_file(Path(path))
+    if verify is not None:
+        stream = checksum.Checksum(stream, algorithm)
+
+    try:
+        with open(local_path, 'wb') as f:
+            size = write_behind(stream, f, max_pending)
+        if verify is not None:
+            checksum.verify(stream, verify, path)
+        return size
+    except BaseException:
+        if os.path.exists(local_path):
+            os.remove(local_path)
+        raise
+
+
+def download_many(filesystem, paths, max_workers=8, max_pending=64,
+                  verify=None, algorithm='sha256'):
+    """Download many files concurrently.
+
+    :param filesystem: the :py:class:`xenon.FileSystem` to read from.
+    :param paths: iterable of `(path, local_path)` pairs.
+    :param max_workers: maximum number of concurrent transfers.
+    :param max_pending: maximum number of chunks per transfer waiting to be
+        written.
+    :param verify: scheduler used to verify checksums, see
+        :py:func:`download`.
+    :param algorithm: the checksum algorithm used for verification.
+    :return: list with the number of bytes transferred for each pair."""
+    return run_all(
+        lambda path, local_path: download(
+            filesystem, path, local_path, max_pending, verify, algorithm),
+        paths, max_workers)
+
+
+def upload(filesystem, local_path, path, chunk_size=CHUNK_SIZE,
+           verify=None, algorithm='sha256'):
+    """Upload the file at `local_path` to `path`, which should not exist
+    yet. The file is sent in messages of `chunk_size` bytes. The size of the
+    file is sent along, as some adaptors need it before writing.
+
+    :param filesystem: the :py:class:`xenon.FileSystem` to write to.
+    :param local_path: the local path.
+    :param path: the remote path.
+    :param chunk_size: size of the messages in bytes.
+    :param verify: a :py:class:`xenon.Scheduler` sharing the file system. If
+        given, the checksum of the sent data is compared with the checksum
+        computed by a job on this scheduler.
+    :param algorithm: the checksum algorithm used for verification.
+    :return: the number of bytes transferred."""
+    local_path = str(local_path)
+    with open(local_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        chunks = read_chunks(f, chunk_size)
+        if verify is not None:
+            chunks = checksum.Checksum(chunks, algorithm)
+        filesystem.write_to_file(Path(path), chunks, size=size)
+
+    if verify is not None:
+        checksum.verify(chunks, verify, path)
+    return size
+
+
+def upload_many(filesystem, paths, max_workers=8, chunk_size=CHUNK_SIZE,
+                verify=None, algorithm='sha256'):
+    """Upload many files concurrently.
+
+    :param filesystem: the :py:class:`xenon.FileSystem` to write to.
+    :param paths: iterable of `(local_path, path)` pairs.
+    :param max_workers: maximum number of concurrent transfers.
+    :param chunk_size: size of the messages in bytes.
+    :param verify: scheduler used to verify checksums, see :py:func:`upload`.
+    :param algorithm: the checksum algorithm used for verification.
+    :return: list with the number of bytes transferred for each pair."""
+    return run_all(
+        lambda local_path, path: upload(
+            filesystem, local_path, path, chunk_size, verify, algorithm),
+        paths, max_workers)